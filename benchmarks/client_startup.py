@@ -0,0 +1,122 @@
+"""
+Compare one boto3 session per service and target, as ecsctl used to create them,
+with the shared ClientFactory: time to set up clients, and TCP connections and
+time spent on bursts of concurrent calls against a local keep-alive endpoint.
+
+Usage: python -m benchmarks.client_startup [--regions 4] [--calls 100] [--workers 16]
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from boto3.session import Session
+from concurrent.futures import ThreadPoolExecutor
+from ecsctl.services.clients import ClientFactory
+from ecsctl.services.throttle import RETRY_CONFIG
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, List
+
+BURSTS = 5
+REGIONS = ["eu-west-1", "us-east-1", "ap-south-1", "eu-central-1", "us-west-2"]
+
+
+class EcsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.02
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps({"clusterArns": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+
+def separate_clients(regions: List[str]) -> List[Any]:
+    clients = []
+    for region in regions:
+        for service in ("ecs", "logs"):
+            session = Session(region_name=region)
+            clients.append(session.client(service, config=RETRY_CONFIG))
+    return clients
+
+
+def shared_clients(regions: List[str]) -> List[Any]:
+    factory = ClientFactory(max_pool_connections=16)
+    return [
+        factory.client(service, None, region)
+        for region in regions
+        for service in ("ecs", "logs")
+    ]
+
+
+def time_startup(create: Callable[[List[str]], List[Any]], regions: List[str]):
+    started = time.perf_counter()
+    create(regions)
+    return time.perf_counter() - started
+
+
+def bursts(client: Any, server: CountingServer, calls: int, workers: int):
+    # Fan-out comes in bursts, e.g. list pages followed by describe batches, and
+    # connections that don't fit the pool between bursts have to be set up again.
+    server.connections = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(BURSTS):
+            list(executor.map(lambda _: client.list_clusters(), range(calls)))
+    return time.perf_counter() - started, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    regions = REGIONS[: args.regions]
+    # Warm up module imports so both variants pay only for sessions and clients.
+    Session(region_name="eu-west-1").client("ecs")
+
+    separate = time_startup(separate_clients, regions)
+    shared = time_startup(shared_clients, regions)
+    print(f"startup, session per client: {separate:.2f}s")
+    print(f"startup, shared sessions:    {shared:.2f}s ({separate / shared:.1f}x)")
+
+    server = CountingServer(("127.0.0.1", 0), EcsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    session = Session(
+        aws_access_key_id="test", aws_secret_access_key="test", region_name=regions[0]
+    )
+
+    default = session.client("ecs", endpoint_url=endpoint, config=RETRY_CONFIG)
+    factory = ClientFactory(max_pool_connections=args.workers * 2)
+    sized = session.client("ecs", endpoint_url=endpoint, config=factory.config)
+
+    for name, client in (("default pool", default), ("sized pool  ", sized)):
+        elapsed, connections = bursts(client, server, args.calls, args.workers)
+        print(f"{name}: {elapsed:.2f}s, {connections} connections")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare running `ecsctl get clusters` repeatedly in-process with forwarding it to a
+running ecsctld, against a local endpoint.
+
+Usage: python -m benchmarks.daemon [--calls 20]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.first_call import EcsHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+
+def time_calls(calls: int, env: dict) -> float:
+    command = [sys.executable, "-m", "ecsctl", "get", "clusters"]
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        subprocess.run(command, env=env, check=True, capture_output=True)
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EcsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {
+            **os.environ,
+            "HOME": home,
+            "XDG_RUNTIME_DIR": home,
+            "AWS_ACCESS_KEY_ID": "test",
+            "AWS_SECRET_ACCESS_KEY": "test",
+            "AWS_REGION": "eu-west-1",
+            "AWS_ENDPOINT_URL": f"http://127.0.0.1:{server.server_address[1]}",
+        }
+        env.pop("XDG_CACHE_HOME", None)
+
+        in_process = time_calls(args.calls, {**env, "ECS_CTL_NO_DAEMON": "1"})
+        print(f"in-process: {in_process * 1000:6.1f}ms per call")
+
+        daemon = subprocess.Popen([sys.executable, "-m", "ecsctl.daemon"], env=env)
+        socket = Path(f"{home}/ecs-ctl/daemon.sock")
+        while not socket.exists():
+            time.sleep(0.05)
+
+        try:
+            # The first command warms the daemon up
+            time_calls(1, env)
+            forwarded = time_calls(args.calls, env)
+            print(
+                f"ecsctld:    {forwarded * 1000:6.1f}ms per call "
+                f"({in_process / forwarded:.1f}x)"
+            )
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
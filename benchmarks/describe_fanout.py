@@ -0,0 +1,86 @@
+"""
+Compare serial and pipelined, concurrent list/describe fan-out in EcsService
+against a stubbed ECS client that sleeps to simulate network latency.
+
+Usage: python -m benchmarks.describe_fanout [--tasks 3000] [--latency 0.08]
+"""
+
+import argparse
+import time
+
+from datetime import datetime
+from ecsctl.services.ecs import EcsService
+from typing import Any, Dict, List
+
+
+def make_task(arn: str) -> Dict[str, Any]:
+    return {
+        "taskArn": arn,
+        "taskDefinitionArn": "arn:aws:ecs:eu-west-1:123456789012:task-definition/api:1",
+        "clusterArn": "arn:aws:ecs:eu-west-1:123456789012:cluster/default",
+        "createdAt": datetime(2024, 1, 1),
+        "lastStatus": "RUNNING",
+        "desiredStatus": "RUNNING",
+        "healthStatus": "HEALTHY",
+        "launchType": "FARGATE",
+        "cpu": "256",
+        "memory": "512",
+        "group": "service:api",
+        "tags": [],
+        "containers": [],
+    }
+
+
+class SlowEcsClient:
+    def __init__(self, task_arns: List[str], latency: float):
+        self.task_arns = task_arns
+        self.latency = latency
+
+    def list_tasks(self, **kwargs):
+        time.sleep(self.latency)
+        start = int(kwargs.get("nextToken", "0"))
+        end = start + kwargs["maxResults"]
+        response = {"taskArns": self.task_arns[start:end]}
+
+        if end < len(self.task_arns):
+            response["nextToken"] = str(end)
+
+        return response
+
+    def describe_tasks(self, cluster: str, tasks: List[str]):
+        time.sleep(self.latency)
+        return {"tasks": [make_task(arn) for arn in tasks]}
+
+
+def run(client: SlowEcsClient, concurrency: int) -> float:
+    ecs_api = EcsService(client, concurrency=concurrency)
+
+    started = time.perf_counter()
+    ecs_api.get_tasks("default")
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.08)
+    args = parser.parse_args()
+
+    task_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:task/default/{i}"
+        for i in range(args.tasks)
+    ]
+    client = SlowEcsClient(task_arns, args.latency)
+
+    baseline = run(client, concurrency=1)
+    print(f"concurrency  1: {baseline:.2f}s")
+
+    for concurrency in (4, 8, 16):
+        elapsed = run(client, concurrency=concurrency)
+        print(
+            f"concurrency {concurrency:2}: {elapsed:.2f}s ({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure deserialize_task over a recorded describe_tasks payload, comparing table
+output, which only reads Task.DEFAULT_COLUMNS, with building every nested object as
+the deserializer used to do eagerly.
+
+Usage: python -m benchmarks.deserialize_tasks [--tasks 20000]
+"""
+
+import argparse
+import copy
+import json
+import time
+import tracemalloc
+
+from datetime import datetime
+from ecsctl.models import Task
+from ecsctl.serializers import deserialize_task
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def parse_dates(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn recorded timestamps back into the datetimes boto3 returns."""
+    return {
+        key: (
+            datetime.fromisoformat(value)
+            if key.endswith("At") and isinstance(value, str)
+            else value
+        )
+        for key, value in item.items()
+    }
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "describe_tasks.json"
+
+
+def read_columns(task: Task):
+    for name in Task.DEFAULT_COLUMNS:
+        task.__dict__[name]
+
+
+def build_everything(task: Task):
+    read_columns(task)
+    for container in task.containers:
+        list(container.network_bindings)
+        list(container.network_interfaces)
+        list(container.managed_agents)
+    list(task.attachments)
+    if task.overrides is not None:
+        list(task.overrides.container_overrides or [])
+
+
+def deserialize_all(payloads: List[Dict[str, Any]], consume: Callable[[Task], None]):
+    tasks = [deserialize_task(payload) for payload in payloads]
+    for task in tasks:
+        consume(task)
+    return tasks
+
+
+def run(payloads: List[Dict[str, Any]], consume: Callable[[Task], None]):
+    started = time.perf_counter()
+    deserialize_all(payloads, consume)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    deserialize_all(payloads, consume)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+
+    recorded = json.loads(FIXTURE.read_text(), object_hook=parse_dates)["tasks"]
+    payloads = [copy.deepcopy(recorded[i % len(recorded)]) for i in range(args.tasks)]
+
+    for name, consume in (("eager", build_everything), ("table", read_columns)):
+        elapsed, peak = run(payloads, consume)
+        print(
+            f"{name}: {elapsed * 1000:.0f}ms, "
+            f"{args.tasks / elapsed:,.0f} tasks/s, peak {peak / 1024 / 1024:.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure the time from starting `ecsctl get clusters` until its first API call
+reaches a local endpoint, and until it finishes, with the full botocore service models (--no-cache) and
+with the trimmed models from a warm cache, for one and for several regions.
+
+Usage: python -m benchmarks.first_call [--runs 5] [--command "python -m ecsctl"]
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+REGIONS = "eu-west-1,us-east-1,ap-south-1,eu-central-1"
+
+
+class EcsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    first_request: Optional[float] = None
+
+    def do_POST(self):
+        if EcsHandler.first_request is None:
+            EcsHandler.first_request = time.perf_counter()
+
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"clusterArns": [], "clusters": [], "failures": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_to_first_call(command: List[str], env: dict) -> Tuple[float, float]:
+    """Time until the first API call and until the command finished."""
+    EcsHandler.first_request = None
+    started = time.perf_counter()
+    subprocess.run(command, env=env, check=True, capture_output=True)
+    finished = time.perf_counter()
+
+    if EcsHandler.first_request is None:
+        raise Exception(f"{shlex.join(command)} didn't call the endpoint")
+    return EcsHandler.first_request - started, finished - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", default=f"{sys.executable} -m ecsctl")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EcsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {
+            **os.environ,
+            "HOME": home,
+            "AWS_ACCESS_KEY_ID": "test",
+            "AWS_SECRET_ACCESS_KEY": "test",
+            "AWS_REGION": "eu-west-1",
+            "AWS_ENDPOINT_URL": f"http://127.0.0.1:{server.server_address[1]}",
+        }
+        env.pop("XDG_CACHE_HOME", None)
+
+        for regions in (None, REGIONS):
+            options = ["--regions", regions] if regions is not None else []
+            label = f"{len(regions.split(',')) if regions else 1} region(s)"
+
+            for name, cache in (
+                ("full models   ", ["--no-cache"]),
+                ("trimmed models", []),
+            ):
+                command = shlex.split(args.command) + cache + options
+                command += ["get", "clusters"]
+                # The first run writes the trimmed models, measure warm starts only
+                time_to_first_call(command, env)
+
+                runs = [time_to_first_call(command, env) for _ in range(args.runs)]
+                first_call = min(run[0] for run in runs) * 1000
+                total = min(run[1] for run in runs) * 1000
+                print(
+                    f"{label}, {name}: {first_call:6.1f}ms to first API call, "
+                    f"{total:6.1f}ms in total"
+                )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
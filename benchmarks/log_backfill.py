@@ -0,0 +1,93 @@
+"""
+Measure reading a day of logs for an incident review on one call chain and split
+into time windows read in parallel, against a fake client with a fixed latency per
+page of up to 10000 events, and the peak memory each read takes, which is measured
+in a second pass without latency as tracing slows everything down.
+
+Usage: python -m benchmarks.log_backfill [--hours 24] [--rate 2] [--latency 0.5]
+"""
+
+import argparse
+import bisect
+import time
+import tracemalloc
+
+from ecsctl.services.logs import ONE_HOUR, AWSLogs
+from typing import Any, Dict, Optional
+
+START = 1_700_000_000_000
+PAGE_SIZE = 10000
+
+
+class FakeLogsClient:
+    def __init__(self, hours: int, rate: float, latency: float):
+        self.latency = latency
+        self.timestamps = list(
+            range(START, START + hours * ONE_HOUR * 1000, int(1000 / rate))
+        )
+
+    def filter_log_events(
+        self, startTime: int, endTime: int, nextToken: Optional[int] = None, **kwargs
+    ) -> Dict[str, Any]:
+        time.sleep(self.latency)
+
+        start = nextToken or bisect.bisect_left(self.timestamps, startTime)
+        end = bisect.bisect_right(self.timestamps, endTime)
+        page_end = min(start + PAGE_SIZE, end)
+
+        response: Dict[str, Any] = {
+            "events": [
+                {
+                    "logStreamName": "api/app/1",
+                    "timestamp": timestamp,
+                    "message": f"GET /orders/{timestamp} 200 12ms",
+                    "ingestionTime": timestamp,
+                    "eventId": str(timestamp),
+                }
+                for timestamp in self.timestamps[start:page_end]
+            ]
+        }
+        if page_end < end:
+            response["nextToken"] = page_end
+        return response
+
+
+def read(client: FakeLogsClient, start: str, end: str, parallel: int) -> int:
+    logs = AWSLogs(client, concurrency=8)
+    lines = logs.query_logs("group", ["api/app/1"], start, end, partitions=parallel)
+    return sum(1 for _ in lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--rate", type=float, default=2, help="Lines per second")
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    client = FakeLogsClient(args.hours, args.rate, args.latency)
+    start = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(START / 1000))
+    end = time.strftime(
+        "%Y-%m-%dT%H:%M:%SZ", time.gmtime(START / 1000 + args.hours * ONE_HOUR - 1)
+    )
+
+    for parallel in (1, 8):
+        started = time.perf_counter()
+        count = read(client, start, end, parallel)
+        elapsed = time.perf_counter() - started
+
+        client.latency = 0
+        tracemalloc.start()
+        read(client, start, end, parallel)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        client.latency = args.latency
+
+        print(
+            f"--parallel {parallel}: {count} lines in {elapsed:5.2f}s "
+            f"({count / elapsed:9,.0f} lines/s), peak {peak / 1024 / 1024:5.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure de-duplicating log events by eventId over a window of the last 10000 ids,
+comparing a deque, whose membership test scans the window, with a BoundedSet, and
+the lines per second AWSLogs.query_logs delivers from pages of events.
+
+Usage: python -m benchmarks.log_dedup [--events 1000000]
+"""
+
+import argparse
+import time
+
+from collections import deque
+from ecsctl.services.logs import AWSLogs
+from ecsctl.utils import BoundedSet
+from typing import Any, Callable, Deque, Dict, List
+
+WINDOW = AWSLogs.MAX_EVENTS_PER_CALL
+PAGE_SIZE = 1000
+
+
+def dedup_deque(event_ids: List[str]) -> int:
+    seen: Deque[str] = deque(maxlen=WINDOW)
+    unique = 0
+    for event_id in event_ids:
+        if event_id not in seen:
+            seen.append(event_id)
+            unique += 1
+    return unique
+
+
+def dedup_bounded_set(event_ids: List[str]) -> int:
+    seen: BoundedSet[str] = BoundedSet(WINDOW)
+    return sum(1 for event_id in event_ids if seen.add(event_id))
+
+
+class FakeLogsClient:
+    def __init__(self, events: int):
+        self.pages = [
+            [
+                {
+                    "logStreamName": "api/app/1",
+                    "timestamp": 1700000000000 + index,
+                    "message": f"line {index}",
+                    "ingestionTime": 1700000000000 + index,
+                    "eventId": str(index),
+                }
+                for index in range(start, min(start + PAGE_SIZE, events))
+            ]
+            for start in range(0, events, PAGE_SIZE)
+        ]
+
+    def filter_log_events(self, nextToken: int = 0, **kwargs) -> Dict[str, Any]:
+        response: Dict[str, Any] = {"events": self.pages[nextToken]}
+        if nextToken + 1 < len(self.pages):
+            response["nextToken"] = nextToken + 1
+        return response
+
+
+def timed(run: Callable[..., int], *args: Any) -> float:
+    started = time.perf_counter()
+    run(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Every page repeats the last events of the previous one, as tailing does
+    event_ids = [
+        str(index - (index % PAGE_SIZE < 10) * 10) for index in range(args.events)
+    ]
+
+    # The deque scans the whole window per event, a sample is plenty to compare
+    for name, dedup, sample in (
+        ("deque     ", dedup_deque, event_ids[:100_000]),
+        ("BoundedSet", dedup_bounded_set, event_ids),
+    ):
+        elapsed = timed(dedup, sample)
+        print(f"{name}: {len(sample) / elapsed:12,.0f} ids/s")
+
+    client = FakeLogsClient(args.events)
+    logs = AWSLogs(client)
+    elapsed = timed(lambda: sum(1 for _ in logs.query_logs("group", [], None, None)))
+    print(f"query_logs: {args.events / elapsed:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
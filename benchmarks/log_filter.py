@@ -0,0 +1,90 @@
+"""
+Measure the bytes transferred and the time taken to find the lines containing a
+rare error, downloading every line and matching them client-side as --grep with a
+regular expression does, and with the filter pattern --grep pushes down for plain
+text, against a fake client with a fixed latency per page.
+
+Usage: python -m benchmarks.log_filter [--events 200000] [--latency 0.05]
+"""
+
+import argparse
+import json
+import re
+import time
+
+from ecsctl.services.logs import AWSLogs
+from typing import Any, Dict, List, Optional
+
+PAGE_SIZE = 10000
+NEEDLE = "java.lang.OutOfMemoryError"
+
+
+class FakeLogsClient:
+    """Applies quoted-term filter patterns like CloudWatch Logs does."""
+
+    def __init__(self, events: int, latency: float):
+        self.latency = latency
+        self.bytes = 0
+        self.events: List[Dict[str, Any]] = [
+            {
+                "logStreamName": "api/app/1",
+                "timestamp": 1700000000000 + index,
+                "message": (
+                    f"{NEEDLE}: Java heap space"
+                    if index % 1000 == 999
+                    else f"GET /orders/{index} 200 12ms user-agent=ELB-HealthChecker"
+                ),
+                "ingestionTime": 1700000000000 + index,
+                "eventId": str(index),
+            }
+            for index in range(events)
+        ]
+
+    def filter_log_events(
+        self,
+        filterPattern: Optional[str] = None,
+        nextToken: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        time.sleep(self.latency)
+
+        events = self.events
+        if filterPattern is not None:
+            term = filterPattern.strip('"')
+            events = [event for event in events if term in event["message"]]
+
+        start = nextToken or 0
+        response: Dict[str, Any] = {"events": events[start : start + PAGE_SIZE]}
+        if start + PAGE_SIZE < len(events):
+            response["nextToken"] = start + PAGE_SIZE
+
+        self.bytes += len(json.dumps(response))
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for name, expression in (
+        ("client-side", f"{re.escape(NEEDLE)}: .* space"),
+        ("server-side", re.escape(NEEDLE)),
+    ):
+        client = FakeLogsClient(args.events, args.latency)
+        logs = AWSLogs(client)
+
+        started = time.perf_counter()
+        grep = re.compile(expression)
+        matches = sum(1 for _ in logs.query_logs("group", [], "1h", None, grep=grep))
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{name}: {matches} matches, {client.bytes / 1024 / 1024:7.2f}MiB "
+            f"transferred in {elapsed * 1000:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure how long `logs --tail` takes to reach current output on a stream with a
+week of history, against a fake client with a fixed latency per call, reading the
+whole history (--start with a week) and reading the default window.
+
+Usage: python -m benchmarks.log_first_line [--latency 0.05]
+"""
+
+import argparse
+import bisect
+import time
+
+from ecsctl.services.logs import ONE_MINUTE, ONE_WEEK, AWSLogs
+from typing import Any, Dict, List, Optional
+
+PAGE_SIZE = 10000
+
+
+class FakeLogsClient:
+    """One event per second for the last week."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        now = int(time.time() * 1000)
+        self.timestamps = list(range(now - ONE_WEEK * 1000, now, 1000))
+
+    def filter_log_events(
+        self, startTime: int = 0, nextToken: Optional[int] = None, **kwargs
+    ) -> Dict[str, Any]:
+        time.sleep(self.latency)
+
+        start = nextToken or bisect.bisect_left(self.timestamps, startTime)
+        events: List[Dict[str, Any]] = [
+            {
+                "logStreamName": "api/app/1",
+                "timestamp": timestamp,
+                "message": "line",
+                "ingestionTime": timestamp,
+                "eventId": str(timestamp),
+            }
+            for timestamp in self.timestamps[start : start + PAGE_SIZE]
+        ]
+
+        response: Dict[str, Any] = {"events": events}
+        if start + PAGE_SIZE < len(self.timestamps):
+            response["nextToken"] = start + PAGE_SIZE
+        return response
+
+
+def time_to_current_output(logs: AWSLogs, start_time: Optional[str]) -> float:
+    started = time.perf_counter()
+    recent = (time.time() - ONE_MINUTE) * 1000
+
+    for line in logs.query_logs("group", ["api/app/1"], start_time, None, tail=True):
+        if line.timestamp >= recent:
+            return time.perf_counter() - started
+
+    raise Exception("Never reached current output")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    logs = AWSLogs(FakeLogsClient(args.latency))
+
+    for name, start_time in (("whole history ", "1w"), ("default window", None)):
+        elapsed = time_to_current_output(logs, start_time)
+        print(f"{name}: {elapsed * 1000:8.1f}ms to current output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure the lines per second `logs` writes into a pipe: printing and flushing every
+line as it did for one task, styling and echoing every line as it did for several
+tasks, and through a LogWriter with the prefixes rendered once.
+
+Usage: python -m benchmarks.log_output [--lines 200000]
+"""
+
+import argparse
+import click
+import io
+import os
+import sys
+import threading
+import time
+
+from ecsctl.services.console import LogWriter
+from ecsctl.utils import BASE_SHELL_COLORS
+from typing import Callable, List, Tuple
+
+STREAMS = [f"api/app/{index:032x}" for index in range(8)]
+
+
+def echo_lines(lines: List[Tuple[str, str]]):
+    color_map = dict(zip(STREAMS, BASE_SHELL_COLORS, strict=True))
+
+    for stream_name, message in lines:
+        task_id = stream_name.split("/")[-1]
+        click.echo(click.style(task_id, fg=color_map[stream_name]), nl=False)
+        click.echo(": ", nl=False)
+        click.echo(message)
+
+
+def write_lines(lines: List[Tuple[str, str]]):
+    prefixes = {
+        stream_name: f"{click.style(stream_name.split('/')[-1], fg=color)}: "
+        for stream_name, color in zip(STREAMS, BASE_SHELL_COLORS, strict=True)
+    }
+
+    with LogWriter(sys.stdout, prefixes) as writer:
+        for stream_name, message in lines:
+            writer.write(stream_name, message)
+
+
+def print_lines(lines: List[Tuple[str, str]]):
+    """How a single task's lines were printed, flushing each one into a pipe."""
+    for _, message in lines:
+        print(message, flush=True)
+
+
+def drain(fd: int):
+    while os.read(fd, 65536) != b"":
+        pass
+
+
+def into_pipe(write: Callable[[List[Tuple[str, str]]], None], lines) -> float:
+    """Time write with stdout pointed at a pipe that is drained on another thread."""
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=drain, args=(read_fd,))
+    reader.start()
+
+    stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(os.fdopen(write_fd, "wb"), line_buffering=False)
+    try:
+        started = time.perf_counter()
+        write(lines)
+        sys.stdout.flush()
+        return time.perf_counter() - started
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+        reader.join()
+        os.close(read_fd)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    lines = [
+        (STREAMS[index % len(STREAMS)], f"GET /health 200 {index}")
+        for index in range(args.lines)
+    ]
+
+    for name, write in (
+        ("print and flush", print_lines),
+        ("echo and style ", echo_lines),
+        ("LogWriter      ", write_lines),
+    ):
+        elapsed = into_pipe(write, lines)
+        print(f"{name}: {args.lines / elapsed:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure the lines per second `logs` delivers to a slow output, reading lines as the
+output asks for them (--concurrency 1) and reading them ahead on a background thread
+into a bounded buffer, against a fake client with a fixed latency per call.
+
+Usage: python -m benchmarks.log_pipeline [--pages 20] [--latency 0.05]
+"""
+
+import argparse
+import time
+
+from ecsctl.services.logs import AWSLogs
+from typing import Any, Dict, Optional
+
+PAGE_SIZE = 1000
+
+
+class FakeLogsClient:
+    def __init__(self, pages: int, latency: float):
+        self.pages = pages
+        self.latency = latency
+
+    def filter_log_events(
+        self, nextToken: Optional[int] = None, **kwargs
+    ) -> Dict[str, Any]:
+        time.sleep(self.latency)
+
+        page = nextToken or 0
+        response: Dict[str, Any] = {
+            "events": [
+                {
+                    "logStreamName": "api/app/1",
+                    "timestamp": 1700000000000 + index,
+                    "message": f"line {index}",
+                    "ingestionTime": 1700000000000 + index,
+                    "eventId": str(index),
+                }
+                for index in range(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)
+            ]
+        }
+        if page + 1 < self.pages:
+            response["nextToken"] = page + 1
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for name, concurrency in (("on demand ", 1), ("read ahead", 8)):
+        logs = AWSLogs(FakeLogsClient(args.pages, args.latency), concurrency)
+
+        started = time.perf_counter()
+        count = 0
+        for _ in logs.query_logs("group", ["api/app/1"], "1h", None):
+            count += 1
+            # An output as slow as the API, e.g. a pager or a terminal
+            if count % PAGE_SIZE == 0:
+                time.sleep(args.latency)
+        elapsed = time.perf_counter() - started
+
+        print(f"{name}: {count / elapsed:10,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the lines per second AWSLogs.query_logs delivers for a service with many
+tasks against a fake client with a fixed latency per call, fetching every stream on
+one call chain (--concurrency 1) and on parallel per-stream call chains.
+
+Usage: python -m benchmarks.log_streams [--streams 32] [--events 2000] [--latency 0.05]
+"""
+
+import argparse
+import time
+
+from ecsctl.services.logs import AWSLogs
+from typing import Any, Dict, List, Tuple
+
+PAGE_SIZE = 1000
+
+
+class FakeLogsClient:
+    """Pages of events across all requested streams, in timestamp order."""
+
+    def __init__(self, streams: List[str], events: int, latency: float):
+        self.latency = latency
+        self.selected: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        self.events = [
+            {
+                "logStreamName": streams[index % len(streams)],
+                "timestamp": 1700000000000 + index,
+                "message": f"line {index}",
+                "ingestionTime": 1700000000000 + index,
+                "eventId": str(index),
+            }
+            for index in range(events * len(streams))
+        ]
+
+    def select(self, streams: List[str]) -> List[Dict[str, Any]]:
+        """The events of streams, computed once so the fake costs no CPU per call."""
+        key = tuple(streams)
+        if key not in self.selected:
+            names = set(streams)
+            self.selected[key] = [
+                event for event in self.events if event["logStreamName"] in names
+            ]
+        return self.selected[key]
+
+    def filter_log_events(
+        self, logStreamNames: List[str], nextToken: int = 0, **kwargs
+    ) -> Dict[str, Any]:
+        time.sleep(self.latency)
+
+        events = self.select(logStreamNames)
+        response: Dict[str, Any] = {"events": events[nextToken : nextToken + PAGE_SIZE]}
+        if nextToken + PAGE_SIZE < len(events):
+            response["nextToken"] = nextToken + PAGE_SIZE
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=32)
+    parser.add_argument("--events", type=int, default=2000, help="Events per stream")
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    streams = [f"api/app/{index}" for index in range(args.streams)]
+    client = FakeLogsClient(streams, args.events, args.latency)
+
+    for selection in [streams] + [[stream] for stream in streams]:
+        client.select(selection)
+
+    for concurrency in (1, 10):
+        logs = AWSLogs(client, concurrency=concurrency)
+
+        started = time.perf_counter()
+        timestamps = [
+            line.timestamp for line in logs.query_logs("group", streams, None, None)
+        ]
+        elapsed = time.perf_counter() - started
+
+        assert timestamps == sorted(timestamps)
+        print(
+            f"concurrency {concurrency:2}: {len(timestamps) / elapsed:10,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Simulate `logs --tail` on a virtual clock against a quiet stream, a busy one and a
+bursty one, busy for a minute out of every five, and report API calls per minute,
+lines per call and how long lines took to show up, polling every five seconds as
+before and adaptively.
+
+Usage: python -m benchmarks.log_tail [--minutes 30]
+"""
+
+import argparse
+import bisect
+
+from ecsctl.services import logs as logs_module
+from ecsctl.services.logs import ONE_MINUTE, AWSLogs, PollInterval
+from typing import Any, Dict, List, Optional
+
+START = 1_700_000_000.0
+
+
+class VirtualClock:
+    """Stands in for the time module, sleeping only advances it."""
+
+    def __init__(self):
+        self.now = START
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class EndOfSimulation(Exception):
+    pass
+
+
+# Lines per second and the minutes out of every five the stream is busy for
+SCENARIOS = {"quiet ": (1 / 60, 5), "busy  ": (10, 5), "bursty": (10, 1)}
+
+
+class SimulatedLogsClient:
+    def __init__(
+        self, clock: VirtualClock, minutes: int, rate: float, busy_minutes: int
+    ):
+        self.clock = clock
+        self.end = START + minutes * ONE_MINUTE
+        offsets = (index / rate for index in range(int(minutes * ONE_MINUTE * rate)))
+        self.timestamps = [
+            int((START + offset) * 1000)
+            for offset in offsets
+            if (offset // ONE_MINUTE) % 5 < busy_minutes
+        ]
+
+    def filter_log_events(
+        self, startTime: int = 0, nextToken: Optional[int] = None, **kwargs
+    ) -> Dict[str, Any]:
+        self.clock.sleep(0.05)
+        if self.clock.now > self.end:
+            raise EndOfSimulation()
+
+        now = int(self.clock.now * 1000)
+        start = nextToken or bisect.bisect_left(self.timestamps, startTime)
+        end = min(start + 10000, bisect.bisect_right(self.timestamps, now))
+
+        events: List[Dict[str, Any]] = [
+            {
+                "logStreamName": "api/app/1",
+                "timestamp": timestamp,
+                "message": "line",
+                "ingestionTime": timestamp,
+                "eventId": str(timestamp),
+            }
+            for timestamp in self.timestamps[start:end]
+        ]
+
+        response: Dict[str, Any] = {"events": events}
+        if end < bisect.bisect_right(self.timestamps, now):
+            response["nextToken"] = end
+        return response
+
+
+class FixedInterval(PollInterval):
+    """The previous behaviour, always waiting five seconds."""
+
+    def next(self, lines: int) -> float:
+        return 5.0
+
+
+def simulate(minutes: int, rate: float, busy_minutes: int, fixed: bool) -> str:
+    clock = VirtualClock()
+    logs_module.time = clock  # type: ignore
+    logs_module.PollInterval = FixedInterval if fixed else PollInterval  # type: ignore
+
+    client = SimulatedLogsClient(clock, minutes, rate, busy_minutes)
+    logs = AWSLogs(client)
+
+    delays = []
+    try:
+        for line in logs.query_logs("group", ["api/app/1"], None, None, tail=True):
+            delays.append(clock.now - line.timestamp / 1000)
+    except EndOfSimulation:
+        pass
+
+    calls_per_minute = logs.api_calls / minutes
+    return (
+        f"{calls_per_minute:5.1f} calls/min, "
+        f"{len(delays) / logs.api_calls:6.1f} lines per call, "
+        f"{sum(delays) / len(delays):5.2f}s average delay"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=30)
+    args = parser.parse_args()
+
+    real_time = logs_module.time
+    try:
+        for name, (rate, busy_minutes) in SCENARIOS.items():
+            for label, fixed in (("fixed 5s", True), ("adaptive", False)):
+                result = simulate(args.minutes, rate, busy_minutes, fixed)
+                print(f"{name} {label}: {result}")
+    finally:
+        logs_module.time = real_time
+        logs_module.PollInterval = PollInterval  # type: ignore
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure how long ecsctl takes to import what a command needs, using
+`python -X importtime`, and fail when a command goes over its budget or loads a
+module it shouldn't, e.g. boto3 for `--help`.
+
+Usage: python -m benchmarks.startup [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from typing import Dict, List, Tuple
+
+# Import time budgets in milliseconds, generous enough for a slow CI machine
+BUDGETS: Dict[Tuple[str, ...], float] = {
+    ("--help",): 120,
+    ("config", "view"): 120,
+    ("get", "--help"): 250,
+}
+FORBIDDEN_MODULES: Dict[Tuple[str, ...], List[str]] = {
+    ("--help",): ["boto3", "botocore", "tabulate", "simple_term_menu", "dateutil"],
+    ("config", "view"): ["boto3", "botocore", "tabulate", "simple_term_menu"],
+    ("get", "--help"): ["boto3", "botocore"],
+}
+
+
+def import_times(args: Tuple[str, ...]) -> Tuple[Dict[str, int], float]:
+    """Cumulative import time in microseconds per top-level module and wall time."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ecsctl", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "ECS_CTL_NO_CACHE": "1"},
+    )
+    elapsed = time.perf_counter() - started
+
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            modules[name.strip()] = int(cumulative)
+        else:
+            modules.setdefault(name.strip(), 0)
+
+    return modules, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    for command, budget in BUDGETS.items():
+        runs = [import_times(command) for _ in range(args.runs)]
+        modules = runs[0][0]
+        import_ms = min(sum(run[0].values()) for run in runs) / 1000
+        wall_ms = min(run[1] for run in runs) * 1000
+
+        name = " ".join(command)
+        print(
+            f"{name:12}: imports {import_ms:6.1f}ms (budget {budget:.0f}ms), "
+            f"wall {wall_ms:6.1f}ms, {len(modules)} modules"
+        )
+
+        if import_ms > budget:
+            failures.append(f"{name} took {import_ms:.1f}ms, over {budget:.0f}ms")
+
+        loaded = [module for module in FORBIDDEN_MODULES[command] if module in modules]
+        if len(loaded) > 0:
+            failures.append(f"{name} imported {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    sys.exit(1 if len(failures) > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
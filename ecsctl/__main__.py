@@ -1,7 +1,15 @@
-from ecsctl.commands import cli
+import sys
+
+from ecsctl.daemon import forward
 
 
 def main():
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from ecsctl.commands import cli
+
     cli()
 
 
@@ -0,0 +1,98 @@
+import click
+import typing
+
+from click import Context
+from ecsctl import __version__
+from ecsctl.utils import ExceptionFormattedGroup, split_list
+from ecsctl.services.provider import Props, ServiceProvider
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ecsctl.daemon import ProviderPool
+
+
+@click.group(
+    cls=ExceptionFormattedGroup,
+    lazy_commands={
+        "cache": ("ecsctl.commands.cache:cache", "Inspect and clear the local cache"),
+        "config": ("ecsctl.commands.config:config", "Modify ecsctl config files"),
+        "exec": (
+            "ecsctl.commands.exec:exec",
+            "Execute commands inside a container or EC2 instance.",
+        ),
+        "get": ("ecsctl.commands.get:get", "Get ECS cluster resources"),
+        "logs": (
+            "ecsctl.commands.logs:logs",
+            "Print the logs from a container in a service or task",
+        ),
+        "rollout": (
+            "ecsctl.commands.rollout:rollout",
+            "Manage and rollout ECS deployments",
+        ),
+        "scale": (
+            "ecsctl.commands.scale:scale",
+            "Scale the number of tasks running in an ECS SErvice",
+        ),
+    },
+)
+@click.version_option(version=__version__)
+@click.option("-p", "--profile", envvar="AWS_PROFILE")
+@click.option("-r", "--region", envvar="AWS_REGION")
+@click.option(
+    "--profiles",
+    help="Comma separated list of profiles to query, in parallel",
+)
+@click.option(
+    "--regions",
+    help="Comma separated list of regions to query, in parallel",
+)
+@click.option(
+    "--concurrency",
+    envvar="ECS_CTL_CONCURRENCY",
+    type=click.IntRange(min=1),
+    help="Maximum number of AWS API calls to run in parallel",
+)
+@click.option(
+    "--no-cache",
+    envvar="ECS_CTL_NO_CACHE",
+    is_flag=True,
+    default=False,
+    help="Don't read or write the local cache",
+)
+@click.option(
+    "--cache-responses",
+    envvar="ECS_CTL_CACHE_RESPONSES",
+    is_flag=True,
+    default=False,
+    help="Reuse list and describe responses for a few seconds across invocations",
+)
+@click.option(
+    "--debug", help="Print verbose error messages", is_flag=True, default=False
+)
+@click.pass_context
+def cli(
+    ctx: Context,
+    profile: str,
+    region: str,
+    profiles: Optional[str],
+    regions: Optional[str],
+    concurrency: Optional[int],
+    no_cache: bool,
+    cache_responses: bool,
+    debug: bool,
+):
+    props: Props = {
+        "profile": profile,
+        "region": region,
+        "profiles": split_list(profiles),
+        "regions": split_list(regions),
+        "concurrency": concurrency,
+        "cache": not no_cache,
+        "cache_responses": cache_responses,
+        "debug": debug,
+    }
+
+    # ecsctld passes in a pool of warm providers, see ecsctl.daemon
+    pool = typing.cast(Optional["ProviderPool"], ctx.obj)
+    ctx.obj = pool.provider_for(props) if pool is not None else ServiceProvider(props)
+    ctx.call_on_close(ctx.obj.close)
@@ -0,0 +1,37 @@
+import click
+import json
+
+from ecsctl.commands.common import output_option
+from ecsctl.serializers import serialize_cache_stats
+from ecsctl.services.provider import ServiceProvider
+
+
+@click.group()
+def cache():
+    pass
+
+
+@cache.command(name="stats")
+@output_option
+@click.pass_obj
+def cache_stats(obj: ServiceProvider, output: str):
+    (_, console) = obj.resolve()
+
+    stats = [disk_cache.stats() for disk_cache in obj.disk_caches()]
+
+    if output == "json":
+        console.print(json.dumps([serialize_cache_stats(item) for item in stats]))
+    else:
+        console.table(stats)
+
+
+@cache.command(name="clear")
+@click.pass_obj
+def cache_clear(obj: ServiceProvider):
+    (_, console) = obj.resolve()
+
+    for disk_cache in obj.disk_caches():
+        disk_cache.clear()
+        disk_cache.reset_stats()
+
+    console.print("Cleared the local cache.")
@@ -0,0 +1,122 @@
+import click
+import json
+
+from ecsctl.services.console import Console
+from ecsctl.services.ecs import EcsService
+from ecsctl.services.provider import Origin, ServiceProvider
+from ecsctl.utils import parallel_imap, parallel_map, split_list
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def output_option(function: Any) -> Any:
+    function = click.option("-o", "--output", envvar="ECS_CTL_OUTPUT", default="table")(
+        function
+    )
+    return function
+
+
+def clusters_option(function: Any) -> Any:
+    function = click.option(
+        "--all-clusters",
+        is_flag=True,
+        default=False,
+        help="Query every cluster in the account",
+    )(function)
+    function = click.option(
+        "-c",
+        "--cluster",
+        envvar="ECS_DEFAULT_CLUSTER",
+        required=False,
+        help="Cluster name, or a comma separated list of cluster names",
+    )(function)
+    return function
+
+
+def resolve_clusters(
+    ecs_api: EcsService, cluster: Optional[str], all_clusters: bool
+) -> List[str]:
+    if all_clusters:
+        return sorted(cluster.name for cluster in ecs_api.get_clusters([]))
+
+    if cluster is None:
+        raise Exception(
+            "Invalid options: either --cluster or --all-clusters is required."
+        )
+
+    return split_list(cluster) or []
+
+
+def query_clusters(
+    obj: ServiceProvider,
+    cluster: Optional[str],
+    all_clusters: bool,
+    query: Callable[[EcsService, str], Iterable[T]],
+) -> Generator[Tuple[Origin, T], None, None]:
+    """
+    Run query against every selected cluster of every (profile, region) target
+    concurrently and yield its results, in order, tagged with their origin. A single
+    cluster in a single target is streamed as is and left untagged so the output
+    keeps its usual shape.
+
+    Every target's calls go through the provider's calls semaphore, so however the
+    targets, clusters and describe calls nest, at most --concurrency calls are in
+    flight.
+    """
+    ecs_apis = obj.ecs_apis
+
+    if len(ecs_apis) == 1 and not all_clusters:
+        ecs_api = ecs_apis[0][1]
+        clusters = resolve_clusters(ecs_api, cluster, all_clusters)
+
+        if len(clusters) == 1:
+            for item in query(ecs_api, clusters[0]):
+                yield {}, item
+            return
+
+    def query_target(target: Tuple[Origin, EcsService]) -> List[Tuple[Origin, T]]:
+        origin, ecs_api = target
+        clusters = resolve_clusters(ecs_api, cluster, all_clusters)
+        tag_cluster = all_clusters or len(clusters) > 1
+
+        results = parallel_map(
+            lambda cluster: list(query(ecs_api, cluster)),
+            clusters,
+            ecs_api.concurrency,
+        )
+
+        return [
+            ({**origin, "cluster": cluster} if tag_cluster else origin, item)
+            for cluster, items in zip(clusters, results, strict=True)
+            for item in items
+        ]
+
+    for rows in parallel_imap(query_target, ecs_apis, len(ecs_apis)):
+        yield from rows
+
+
+def print_rows(
+    console: Console,
+    output: str,
+    rows: List[Tuple[Origin, Any]],
+    serialize: Callable[[Any], Dict[str, Any]],
+):
+    if output == "json":
+        console.print(
+            json.dumps([{**origin, **serialize(item)} for origin, item in rows])
+        )
+    else:
+        console.table(
+            [item for _, item in rows], origins=[origin for origin, _ in rows]
+        )
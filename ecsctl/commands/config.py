@@ -0,0 +1,34 @@
+import click
+import json
+
+from ecsctl.services.console import Color
+from ecsctl.services.provider import ServiceProvider
+
+
+@click.group()
+def config():
+    pass
+
+
+@config.command(name="view")
+@click.pass_obj
+def config_view(obj: ServiceProvider):
+    (config, console) = obj.resolve()
+    console.print(json.dumps(config.to_json(), indent=4, sort_keys=True))
+
+
+@config.command(name="set")
+@click.argument("property", required=True)
+@click.argument("value", required=True)
+@click.pass_obj
+def config_set(obj: ServiceProvider, property: str, value: str):
+    (config, console) = obj.resolve()
+
+    if property == "profile":
+        config.set_profile(value)
+        config.save()
+    elif property == "default_cluster":
+        config.set_default_cluster(value)
+        config.save()
+    else:
+        console.print(f"Can't set property {property} to value {value}!", Color.RED)
@@ -0,0 +1,140 @@
+import click
+import os
+import subprocess
+
+from ecsctl.services.console import Color
+from ecsctl.services.provider import ServiceProvider
+from typing import Optional
+
+
+@click.command()
+@click.option("-c", "--cluster", envvar="ECS_DEFAULT_CLUSTER", required=False)
+@click.option("-t", "--task", required=False)
+@click.option("-s", "--service", required=False)
+@click.option("--container", required=False)
+@click.option("--command", required=False)
+@click.option("--ec2", is_flag=True, default=False)
+@click.pass_obj
+def exec(
+    obj: ServiceProvider,
+    cluster: str,
+    service: Optional[str],
+    task: Optional[str],
+    container: Optional[str],
+    command: Optional[str],
+    ec2: bool,
+):
+    (profile, region) = obj.single_target()
+    (config, console, ecs_api) = obj.resolve_all()
+
+    if not config.meets_ssm_prereqs:
+        console.print(
+            "This feature requires the following to be setup correctly:",
+            color=Color.YELLOW,
+        )
+        console.print(
+            "     - You have the AWS cli installed and available on your PATH.",
+            color=Color.YELLOW,
+        )
+        console.print(
+            "     - You have SSM setup and working correctly.", color=Color.YELLOW
+        )
+        console.print(
+            "     - You have the SSM AWS cli plugin installed: https://docs.aws.amazon.com/systems-manager/latest/userguide/session-manager-working-with-install-plugin.html",
+            color=Color.YELLOW,
+        )
+        console.print("")
+
+        response = console.input(
+            "Do you have all prerequisites setup correctly? (y/N) "
+        )
+
+        if response.lower() == "y":
+            config.set_meets_ssm_prereqs()
+            config.save()
+        else:
+            return
+
+    selected_cluster = cluster or config.default_cluster
+
+    if task is None and service is None:
+        raise Exception("Error: service or task must be specified")
+
+    if task is None and service is not None:
+        tasks = ecs_api.get_tasks(cluster=selected_cluster, service=service)
+        _, index = console.choose("Choose a task:", [task.arn for task in tasks])
+        selected_task = tasks[index]
+
+    else:
+        selected_task = ecs_api.get_task_by_id_or_arn(
+            cluster or config.default_cluster, task
+        )
+
+    if ec2:
+        if selected_task.container_instance_id is None:
+            raise Exception(
+                f"Task not running on an EC2 backed instance, launch type is {selected_task.launch_type}."
+            )
+
+        constainer_instances = ecs_api.get_instances(
+            cluster or config.default_cluster, [selected_task.container_instance_id]
+        )
+
+        ec2_instance = constainer_instances[0].ec2_instance_id
+
+        cmd = ["aws"]
+
+        if profile is not None:
+            cmd = cmd + ["--profile", profile]
+
+        if region is not None:
+            cmd = cmd + ["--region", region]
+
+        cmd = cmd + [
+            "ssm",
+            "start-session",
+            "--target",
+            ec2_instance,
+        ]
+    else:
+        if container is None:
+            _, index = console.choose(
+                "Choose a container:",
+                [container.name for container in selected_task.containers],
+            )
+            selected_container = selected_task.containers[index].name
+        else:
+            selected_container = container
+
+        cmd = ["aws"]
+
+        if profile is not None:
+            cmd = cmd + ["--profile", profile]
+
+        if region is not None:
+            cmd = cmd + ["--region", region]
+
+        cmd = cmd + [
+            "ecs",
+            "execute-command",
+            "--cluster",
+            selected_cluster,
+            "--task",
+            selected_task.arn,
+            "--container",
+            selected_container,
+            "--interactive",
+            "--command",
+            command or "/bin/sh",
+        ]
+
+    env = os.environ.copy()
+
+    shell = subprocess.Popen(cmd, env=env)
+
+    while True:
+        try:
+            shell.wait()
+            break
+        except KeyboardInterrupt:
+            pass
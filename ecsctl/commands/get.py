@@ -0,0 +1,263 @@
+import click
+import json
+
+from ecsctl.commands.common import (
+    clusters_option,
+    output_option,
+    print_rows,
+    query_clusters,
+)
+from ecsctl.serializers import (
+    serialize_cluster,
+    serialize_container,
+    serialize_deployment,
+    serialize_instance,
+    serialize_service,
+    serialize_service_event,
+    serialize_task,
+    serialize_task_definition,
+)
+from ecsctl.services.ecs import EcsService
+from ecsctl.services.provider import ServiceProvider
+from ecsctl.utils import AliasedGroup, parallel_map
+from typing import List, Optional
+
+
+@click.group(cls=AliasedGroup)
+def get():
+    pass
+
+
+@get.command(name="clusters")
+@click.argument("cluster_names", nargs=-1)
+@output_option
+@click.pass_obj
+def get_clusters(obj: ServiceProvider, cluster_names: List[str], output: str):
+    (_, console) = obj.resolve()
+
+    ecs_apis = obj.ecs_apis
+    # The table only shows counts, which are part of every describe_clusters response
+    include = EcsService.CLUSTER_DETAILS if output == "json" else []
+
+    results = parallel_map(
+        lambda target: target[1].get_clusters(
+            cluster_names=list(cluster_names), include=include
+        ),
+        ecs_apis,
+        len(ecs_apis),
+    )
+
+    rows = [
+        (origin, cluster)
+        for (origin, _), clusters in zip(ecs_apis, results, strict=True)
+        for cluster in clusters
+    ]
+
+    rows = sorted(rows, key=lambda row: row[1].name)
+
+    print_rows(console, output, rows, serialize_cluster)
+
+
+@get.command(name="instances")
+@click.argument("instance_names", nargs=-1)
+@clusters_option
+@click.option("--status", default=None)
+@click.option("--sort-by", required=False, default="registered_at")
+@output_option
+@click.pass_obj
+def get_instances(
+    obj: ServiceProvider,
+    cluster: str,
+    all_clusters: bool,
+    instance_names: Optional[List[str]],
+    sort_by: Optional[str],
+    status: Optional[str],  # TODO: make this a literal
+    output: str,
+):
+    (config, console) = obj.resolve()
+
+    rows = query_clusters(
+        obj,
+        cluster or config.default_cluster,
+        all_clusters,
+        lambda ecs_api, cluster: ecs_api.iter_instances(
+            cluster, instance_names=list(instance_names), status=status
+        ),
+    )
+
+    rows = sorted(rows, key=lambda row: row[1].__dict__[sort_by], reverse=True)
+
+    print_rows(console, output, rows, serialize_instance)
+
+
+@get.command(name="services")
+@click.argument("service_names", nargs=-1)
+@clusters_option
+@click.option("--sort-by", required=False, default="name")
+@output_option
+@click.pass_obj
+def get_services(
+    obj: ServiceProvider,
+    service_names: List[str],
+    cluster: str,
+    all_clusters: bool,
+    sort_by: str,
+    output: str,
+):
+    (config, console) = obj.resolve()
+
+    rows = query_clusters(
+        obj,
+        cluster or config.default_cluster,
+        all_clusters,
+        lambda ecs_api, cluster: ecs_api.iter_services(
+            cluster, service_names=list(service_names)
+        ),
+    )
+
+    rows = sorted(rows, key=lambda row: row[1].__dict__[sort_by], reverse=True)
+
+    print_rows(console, output, rows, serialize_service)
+
+
+@get.command(name="events")
+@click.argument("service_name", nargs=1, required=True)
+@clusters_option
+@output_option
+@click.pass_obj
+def get_events(
+    obj: ServiceProvider,
+    service_name: str,
+    cluster: str,
+    all_clusters: bool,
+    output: str,
+):
+    (config, console) = obj.resolve()
+
+    rows = query_clusters(
+        obj,
+        cluster or config.default_cluster,
+        all_clusters,
+        lambda ecs_api, cluster: ecs_api.get_events_for_service(
+            cluster, service_name=service_name
+        ),
+    )
+
+    rows = sorted(rows, key=lambda row: row[1].created_at, reverse=True)
+
+    if output != "json" and len(rows) == 0:
+        console.print(f"No events found for service '{service_name}'.")
+    else:
+        print_rows(console, output, rows, serialize_service_event)
+
+
+@get.command(name="deployments")
+@click.argument("service_name", nargs=1, required=True)
+@click.option("-c", "--cluster", envvar="ECS_DEFAULT_CLUSTER", required=False)
+@output_option
+@click.pass_obj
+def get_deployments(
+    obj: ServiceProvider, service_name: str, cluster: str, output: str
+) -> None:
+    (config, console, ecs_api) = obj.resolve_all()
+
+    services = ecs_api.get_services(
+        cluster or config.default_cluster, service_names=[service_name]
+    )
+    deployments = services[0].deployments
+
+    deployments = sorted(deployments, key=lambda x: x.created_at, reverse=True)
+
+    if output == "json":
+        console.print(
+            json.dumps([serialize_deployment(deployment) for deployment in deployments])
+        )
+    else:
+        console.table(deployments)
+
+
+@get.command(name="tasks")
+@click.argument("task_names", nargs=-1, required=False)
+@clusters_option
+@click.option("-s", "--service", required=False)
+@click.option("-f", "--family", required=False)
+@click.option("-i", "--instance", required=False)
+@click.option("--status", default="RUNNING")
+@output_option
+@click.pass_obj
+def get_tasks(
+    obj: ServiceProvider,
+    cluster: str,
+    all_clusters: bool,
+    task_names: Optional[List[str]],
+    instance: Optional[str],
+    service: Optional[str],
+    family: Optional[str],
+    status: Optional[str],
+    output: str,
+):
+    (config, console) = obj.resolve()
+
+    row_stream = query_clusters(
+        obj,
+        cluster or config.default_cluster,
+        all_clusters,
+        lambda ecs_api, cluster: ecs_api.iter_tasks(
+            cluster,
+            task_names_or_arns=list(task_names),
+            instance=instance,
+            service=service,
+            family=family,
+            status=status,
+        ),
+    )
+
+    if output == "json":
+        console.print_json_array(
+            {**origin, **serialize_task(task)} for origin, task in row_stream
+        )
+    else:
+        rows = list(row_stream)
+        if len(rows) > 0:
+            print_rows(console, output, rows, serialize_task)
+        else:
+            console.print("No tasks found for the given search criteria")
+
+
+@get.command(name="containers")
+@click.option("-c", "--cluster", envvar="ECS_DEFAULT_CLUSTER", required=False)
+@click.argument("task_name")
+@output_option
+@click.pass_obj
+def get_containers(obj: ServiceProvider, cluster: str, task_name: str, output: str):
+    (config, console, ecs_api) = obj.resolve_all()
+
+    containers = ecs_api.get_containers(cluster or config.default_cluster, task_name)
+    if output == "json":
+        console.print(
+            json.dumps([serialize_container(container) for container in containers])
+        )
+    else:
+        if len(containers) == 0:
+            console.print("No containers found for the given search criteria.")
+        else:
+            console.table(containers)
+
+
+@get.command(name="definitions")
+@click.argument("definition_family_rev_or_arn")
+@output_option
+@click.pass_obj
+def get_definitions(
+    obj: ServiceProvider, definition_family_rev_or_arn: str, output: str
+):
+    (_, console, ecs_api) = obj.resolve_all()
+
+    definition = ecs_api.get_task_definition(
+        definition_family_rev_or_arn=definition_family_rev_or_arn
+    )
+
+    if output == "json":
+        console.print(json.dumps(serialize_task_definition(definition)))
+    else:
+        console.table([definition])
@@ -0,0 +1,269 @@
+import click
+import contextlib
+import json
+import math
+import re
+import time
+
+from ecsctl.commands.common import output_option
+from ecsctl.services.console import Console
+from ecsctl.services.logs import AWSLogs
+from ecsctl.services.provider import ServiceProvider
+from ecsctl.utils import BASE_SHELL_COLORS
+from typing import Dict, List, Optional
+
+
+def check_options(
+    start: Optional[str],
+    end: Optional[str],
+    parallel: int,
+    lines: Optional[int],
+    tail: bool,
+    filter_pattern: Optional[str],
+    grep: Optional[str],
+    until_match: bool,
+    insights_query: Optional[str],
+) -> Optional[re.Pattern]:
+    """Reject options that can't be combined, returning the compiled --grep."""
+    if lines is not None and (start is not None or end is not None):
+        raise click.BadParameter(
+            "can't be used with --start or --end.", param_hint="'--lines'"
+        )
+
+    if end is not None:
+        check_range(start, end, tail)
+
+    if parallel > 1 and (tail or lines is not None or insights_query is not None):
+        raise Exception(
+            "Invalid options: --parallel can't be used with --tail, --lines or "
+            "--insights."
+        )
+
+    if insights_query is not None and (
+        tail or lines is not None or filter_pattern or grep or until_match
+    ):
+        raise Exception(
+            "Invalid options: --insights can't be used with --tail, --lines, "
+            "--filter-pattern, --grep or --until-match."
+        )
+
+    if filter_pattern is not None and lines is not None:
+        raise Exception("Invalid options: --filter-pattern can't be used with --lines.")
+
+    if until_match and filter_pattern is None and grep is None:
+        raise Exception(
+            "Invalid options: --until-match needs --grep or --filter-pattern."
+        )
+
+    try:
+        return re.compile(grep) if grep is not None else None
+    except re.error as ex:
+        raise Exception(f"Invalid --grep expression: {ex}") from ex
+
+
+def check_range(start: Optional[str], end: str, tail: bool):
+    if tail:
+        raise click.BadParameter("can't be used with --tail.", param_hint="'--end'")
+
+    end_timestamp = AWSLogs.parse_time_ago(end)
+    start_timestamp = (
+        AWSLogs.parse_time_ago(start)
+        if start is not None
+        else int((time.time() - AWSLogs.DEFAULT_WINDOW) * 1000)
+    )
+
+    if end_timestamp is not None and end_timestamp <= start_timestamp:
+        raise click.BadParameter(
+            "must be after --start, or within the last hour without it.",
+            param_hint="'--end'",
+        )
+
+
+def stream_prefixes(console: Console, stream_names: List[str]) -> Dict[str, str]:
+    """Every stream's task id in its own color, rendered once rather than per line."""
+    multiple = math.ceil(len(stream_names) / len(BASE_SHELL_COLORS))
+    colors = BASE_SHELL_COLORS * multiple
+    prefixes: Dict[str, str] = {}
+
+    for stream_name, color in zip(stream_names, colors, strict=False):
+        task_id = stream_name.split("/")[-1]
+        if not console.is_output_redirected():
+            task_id = click.style(task_id, fg=color)
+        prefixes[stream_name] = f"{task_id}: "
+
+    return prefixes
+
+
+def print_query_results(console: Console, output: str, rows: List[Dict[str, str]]):
+    if output == "json":
+        console.print(json.dumps(rows))
+    else:
+        # Rows only hold the fields that have a value, so collect them all
+        fields = list({field: None for row in rows for field in row})
+        console.print_table(
+            fields, [[row.get(field, "") for field in fields] for row in rows]
+        )
+
+
+@click.command()
+@click.option("-c", "--cluster", envvar="ECS_DEFAULT_CLUSTER", required=False)
+@click.option("-s", "--service", "service_name", required=False)
+@click.option("-t", "--task", "task_name", required=False)
+@click.option("--container", "container_name", required=False)
+@click.option(
+    "--start",
+    required=False,
+    help="Read from this time, e.g. '2h ago' or a date, instead of the last hour",
+)
+@click.option(
+    "--end",
+    required=False,
+    help="Read up to this time, e.g. '1h ago' or a date, instead of now",
+)
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Split the range into this many time windows and read them in parallel",
+)
+@click.option(
+    "-n",
+    "--lines",
+    type=click.IntRange(min=0),
+    required=False,
+    help="Read the last N lines of every task instead",
+)
+@click.option("--tail", is_flag=True, default=False)
+@click.option(
+    "--filter-pattern",
+    required=False,
+    help="Only read lines matching this CloudWatch Logs filter pattern",
+)
+@click.option(
+    "--grep",
+    required=False,
+    help="Only read lines matching this regular expression",
+)
+@click.option(
+    "--until-match",
+    is_flag=True,
+    default=False,
+    help="Stop at the first line matching --grep or --filter-pattern",
+)
+@click.option(
+    "--insights",
+    "insights_query",
+    required=False,
+    help="Run a Logs Insights query instead, e.g. 'stats count() by @logStream'",
+)
+@output_option
+@click.pass_obj
+def logs(
+    obj: ServiceProvider,
+    cluster: str,
+    service_name: Optional[str],
+    task_name: Optional[str],
+    container_name: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    parallel: int,
+    lines: Optional[int],
+    tail: bool,
+    filter_pattern: Optional[str],
+    grep: Optional[str],
+    until_match: bool,
+    insights_query: Optional[str],
+    output: str,
+):
+    regex = check_options(
+        start,
+        end,
+        parallel,
+        lines,
+        tail,
+        filter_pattern,
+        grep,
+        until_match,
+        insights_query,
+    )
+
+    (config, console, ecs_api) = obj.resolve_all()
+    aws_logs = obj.logs
+
+    cluster = cluster or config.default_cluster
+
+    if service_name is not None:
+        tasks = ecs_api.get_tasks(cluster=cluster, service=service_name)
+    elif task_name is not None:
+        tasks = ecs_api.get_tasks(cluster=cluster, task_names_or_arns=[task_name])
+    else:
+        raise Exception("Invalid options: either --service or --task is required.")
+
+    if len(tasks) == 0:
+        raise Exception("No tasks found for given options!")
+
+    # TODO: Multiple task definitions can have different configurations!
+    task = tasks[0]
+    definition = ecs_api.get_task_definition(
+        definition_family_rev_or_arn=task.task_definition_arn
+    )
+
+    if container_name is None:
+        (container_name, _) = console.choose(
+            "Pick a container:",
+            [container.name for container in definition.container_definitions],
+        )
+
+    container_definition = next(
+        (x for x in definition.container_definitions if x.name == container_name), None
+    )
+
+    if container_definition is None:
+        raise Exception(f"Can't find definition for container {container_name}.")
+
+    log_configuration = container_definition.log_configuration
+    if log_configuration is None or log_configuration.log_driver != "awslogs":
+        raise Exception(
+            f"Invalid logconfiguration for {container_name}, only awslogs supported!"
+        )
+
+    group = log_configuration.options["awslogs-group"]
+    prefix = log_configuration.options["awslogs-stream-prefix"]
+
+    stream_names = [f"{prefix}/{container_name}/{task.id}" for task in tasks]
+
+    if insights_query is not None:
+        rows = aws_logs.query_insights(
+            group_name=group,
+            stream_names=stream_names,
+            query=insights_query,
+            start_time=start,
+            end_time=end,
+        )
+
+        print_query_results(console, output, rows)
+        return
+
+    log_generator = aws_logs.query_logs(
+        group_name=group,
+        stream_names=stream_names,
+        start_time=start,
+        end_time=end,
+        tail=tail,
+        lines=lines,
+        filter_pattern=filter_pattern,
+        grep=regex,
+        partitions=parallel,
+    )
+
+    prefixes = stream_prefixes(console, stream_names) if len(tasks) > 1 else {}
+
+    # Closed when stopping early, e.g. on --until-match or a closed pipe, so no more
+    # lines are fetched in the background
+    with console.log_writer(prefixes) as writer, contextlib.closing(log_generator):
+        for log_line in log_generator:
+            if not writer.write(log_line.log_stream_name, log_line.message):
+                break
+
+            if until_match:
+                break
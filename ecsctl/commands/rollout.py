@@ -0,0 +1,23 @@
+import click
+
+from ecsctl.services.provider import ServiceProvider
+from ecsctl.utils import AliasedGroup
+
+
+@click.group(cls=AliasedGroup)
+def rollout():
+    pass
+
+
+@rollout.command(name="restart")
+@click.option("-c", "--cluster", envvar="ECS_DEFAULT_CLUSTER", required=False)
+@click.argument("service_name")
+@click.pass_obj
+def rollout_restart(obj: ServiceProvider, cluster: str, service_name: str):
+    (config, console, ecs_api) = obj.resolve_all()
+
+    cluster = cluster or config.default_cluster
+
+    redeployed_service = ecs_api.redeploy_service(cluster=cluster, service=service_name)
+
+    console.print(f"Redeployed {redeployed_service.name}: {redeployed_service.status}!")
@@ -0,0 +1,279 @@
+"""
+ecsctld, an optional resident daemon that keeps sessions, clients, connections and
+caches warm between ecsctl invocations. The CLI forwards non-interactive commands to
+it over a Unix socket and runs them in-process whenever it isn't running.
+
+The protocol is one JSON object per line. The client sends {"args": [...], "env":
+{...}} and the daemon answers with any number of {"stdout": "..."} and
+{"stderr": "..."} messages, followed by {"exit": code}.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TextIO, Tuple
+
+if TYPE_CHECKING:
+    from ecsctl.services.provider import Props, ServiceProvider
+
+# Commands that never prompt and only write to stdout and stderr, so they behave
+# the same whether they run in the daemon or in-process.
+DAEMON_COMMANDS = {"get", "rollout", "scale"}
+# Root options that take a value, see ecsctl.commands.cli
+VALUE_OPTIONS = {
+    "-p",
+    "--profile",
+    "-r",
+    "--region",
+    "--profiles",
+    "--regions",
+    "--concurrency",
+}
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+def socket_path() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", None)
+    if runtime_dir is not None:
+        return Path(f"{runtime_dir}/ecs-ctl/daemon.sock")
+
+    home = os.environ["HOME"]
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", f"{home}/.cache")
+    return Path(f"{xdg_cache}/ecs-ctl/daemon.sock")
+
+
+def command_name(args: List[str]) -> Optional[str]:
+    """The subcommand args invoke, skipping over the root options."""
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if not arg.startswith("-"):
+            return arg
+
+        index += 2 if arg in VALUE_OPTIONS else 1
+
+    return None
+
+
+def forward(
+    args: List[str],
+    path: Optional[Path] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> Optional[int]:
+    """
+    Run args in the daemon, relaying its output, and return the exit code. None
+    means the command has to run in-process: it isn't one the daemon runs, the
+    daemon is disabled with ECS_CTL_NO_DAEMON or it isn't running.
+    """
+    streams = {"stdout": stdout or sys.stdout, "stderr": stderr or sys.stderr}
+
+    if command_name(args) not in DAEMON_COMMANDS or os.environ.get(
+        "ECS_CTL_NO_DAEMON", ""
+    ) not in ("", "0"):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path or socket_path()))
+    except OSError:
+        connection.close()
+        return None
+
+    with connection, connection.makefile("rwb") as stream:
+        request = {"args": args, "env": dict(os.environ)}
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+
+            if "exit" in message:
+                return message["exit"]
+
+            for name, text in message.items():
+                streams[name].write(text)
+                streams[name].flush()
+
+    streams["stderr"].write("ecsctld closed the connection before finishing\n")
+    return 1
+
+
+def shared_files_modified_at() -> List[Optional[int]]:
+    """When the AWS config and shared credentials files were last written, if ever."""
+    paths = [
+        os.environ.get("AWS_CONFIG_FILE", "~/.aws/config"),
+        os.environ.get("AWS_SHARED_CREDENTIALS_FILE", "~/.aws/credentials"),
+    ]
+    modified_at: List[Optional[int]] = []
+
+    for path in paths:
+        try:
+            modified_at.append(os.stat(os.path.expanduser(path)).st_mtime_ns)
+        except OSError:
+            modified_at.append(None)
+
+    return modified_at
+
+
+class ProviderPool:
+    """
+    Warm ServiceProviders, one per set of root options and AWS environment, so
+    sessions, clients and their connection pools are reused across commands. A
+    provider is replaced once the shared config or credentials files were rewritten
+    since it was created, e.g. by `aws configure set` or saml2aws, so it never
+    serves outdated credentials.
+    """
+
+    def __init__(self):
+        self.providers: Dict[str, Tuple[List[Optional[int]], "ServiceProvider"]] = {}
+
+    def provider_for(self, props: "Props") -> "ServiceProvider":
+        from ecsctl.services.config import Config
+        from ecsctl.services.provider import ServiceProvider
+
+        aws_environment = {
+            name: value for name, value in os.environ.items() if name.startswith("AWS_")
+        }
+        key = json.dumps([props, aws_environment], sort_keys=True)
+        modified_at = shared_files_modified_at()
+
+        if key in self.providers and self.providers[key][0] == modified_at:
+            provider = self.providers[key][1]
+            # The config file may have changed since the last command
+            provider.config = Config()
+            return provider
+
+        if key in self.providers:
+            self.retire(self.providers[key][1])
+
+        provider = ServiceProvider(props=props)
+        self.providers[key] = (modified_at, provider)
+        return provider
+
+    def retire(self, provider: "ServiceProvider"):
+        # Only when the provider created any clients
+        if "clients" in provider.__dict__:
+            provider.clients.close()
+
+
+class MessageWriter(io.TextIOBase):
+    """A text stream that sends everything written to it as a protocol message."""
+
+    def __init__(self, stream: Any, name: str):
+        self.stream = stream
+        self.name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        message = json.dumps({self.name: text}).encode("utf-8") + b"\n"
+        self.stream.write(message)
+        self.stream.flush()
+        return len(text)
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        from ecsctl.commands import cli
+
+        request = json.loads(self.rfile.readline())
+        environment = dict(os.environ)
+        stdout, stderr = sys.stdout, sys.stderr
+
+        # Commands are handled one at a time, so they can have the process'
+        # environment and standard streams to themselves while they run.
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.stdout = MessageWriter(self.wfile, "stdout")
+        sys.stderr = MessageWriter(self.wfile, "stderr")
+
+        exit_code = 0
+        try:
+            cli(args=request["args"], prog_name="ecsctl", obj=self.server.pool)
+        except SystemExit as ex:
+            exit_code = ex.code if isinstance(ex.code, int) else 1
+        except Exception as ex:
+            sys.stderr.write(f"{ex}\n")
+            exit_code = 1
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            os.environ.clear()
+            os.environ.update(environment)
+
+        self.wfile.write(json.dumps({"exit": exit_code}).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, path: Path, idle_timeout: float):
+        self.pool = ProviderPool()
+        self.idle = False
+        self.timeout = idle_timeout
+        super().__init__(str(path), CommandHandler)
+
+    def handle_timeout(self):
+        self.idle = True
+
+    def serve_until_idle(self):
+        while not self.idle:
+            self.handle_request()
+
+
+def is_running(path: Path) -> bool:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        connection.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="ecsctld", description="Keep ecsctl warm between invocations"
+    )
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Exit after this many seconds without a command",
+    )
+    args = parser.parse_args()
+
+    path = args.socket or socket_path()
+    if is_running(path):
+        sys.exit(f"ecsctld is already running on {path}")
+
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path.parent.chmod(0o700)
+    path.unlink(missing_ok=True)
+
+    # Clean the socket up when stopped with kill as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    with DaemonServer(path, args.idle_timeout) as server:
+        path.chmod(0o600)
+        try:
+            server.serve_until_idle()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from ecsctl.models.cache import *  # noqa: F401,F403
 from ecsctl.models.cluster import *  # noqa: F401,F403
 from ecsctl.models.instance import *  # noqa: F401,F403
 from ecsctl.models.service import *  # noqa: F401,F403
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    DEFAULT_COLUMNS = [
+        "name",
+        "entries",
+        "size",
+        "hits",
+        "misses",
+        "hit_rate",
+    ]
+
+    name: str
+    entries: int
+    size: int
+    hits: int
+    misses: int
+    hit_rate: str
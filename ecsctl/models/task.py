@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal, List, Optional, Union
+from typing import Literal, List, Optional, Sequence, Union
 
 from ecsctl.models.common import EnvironmentFile, KeyValuePair, ResourceRequirement
 
@@ -110,16 +110,16 @@ class Container:
     cpu: int
     memory: int
     memory_reservation: int
-    network_bindings: List[NetworkBinding]
-    network_interfaces: List[NetworkInterface]
-    managed_agents: List[ManagedAgent]
+    network_bindings: Sequence[NetworkBinding]
+    network_interfaces: Sequence[NetworkInterface]
+    managed_agents: Sequence[ManagedAgent]
     gpu_ids: List[str]
 
 
 # https://docs.aws.amazon.com/AmazonECS/latest/APIReference/API_TaskOverride.html
 @dataclass(frozen=True)
 class TaskOverride:
-    container_overrides: Optional[List[ContainerOverride]]
+    container_overrides: Optional[Sequence[ContainerOverride]]
     cpu: Optional[str]
     inference_accelerator_overrides: Optional[List[InferenceAcceleratorOverride]]
 
@@ -171,6 +171,6 @@ class Task:
     stopped_at: Union[datetime, None]
     stopped_reason: str
     tags: List[str]
-    containers: List[Container]
-    attachments: List[Attachment]
+    containers: Sequence[Container]
+    attachments: Sequence[Attachment]
     overrides: Optional[TaskOverride]
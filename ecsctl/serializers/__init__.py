@@ -1,3 +1,4 @@
+from ecsctl.serializers.serialize_cache import *  # noqa: F401,F403
 from ecsctl.serializers.serialize_cluster import *  # noqa: F401,F403
 from ecsctl.serializers.serialize_instance import *  # noqa: F401,F403
 from ecsctl.serializers.serialize_service import *  # noqa: F401,F403
@@ -0,0 +1,13 @@
+from ecsctl.models import CacheStats
+from typing import Any, Dict
+
+
+def serialize_cache_stats(stats: CacheStats) -> Dict[str, Any]:
+    return {
+        "name": stats.name,
+        "entries": stats.entries,
+        "size": stats.size,
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "hit_rate": stats.hit_rate,
+    }
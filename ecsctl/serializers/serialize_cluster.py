@@ -12,8 +12,8 @@ def deserialize_cluster(cluster: Dict[str, Any]) -> Cluster:
         cluster["runningTasksCount"],
         cluster["pendingTasksCount"],
         cluster.get("statistics", []),
-        cluster["settings"],
-        cluster["capacityProviders"],
+        cluster.get("settings", []),
+        cluster.get("capacityProviders", []),
         cluster.get("defaultCapacityProviderStrategy", []),
         cluster.get("tags", []),
     )
@@ -24,7 +24,7 @@ def serialize_cluster(cluster: Cluster) -> Dict[str, Any]:
         "arn": cluster.arn,
         "name": cluster.name,
         "status": cluster.status,
-        "instances": cluster.status,
+        "instances": cluster.instances,
         "services": cluster.services,
         "running_tasks": cluster.running_tasks,
         "pending_tasks": cluster.pending_tasks,
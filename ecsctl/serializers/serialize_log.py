@@ -10,3 +10,14 @@ def deserialize_log_line(line: Dict[str, Any]) -> LogLine:
         line["ingestionTime"],
         line["eventId"],
     )
+
+
+def deserialize_stream_event(stream_name: str, event: Dict[str, Any]) -> LogLine:
+    """An event of get_log_events, which leaves out the stream name and event id."""
+    return LogLine(
+        stream_name,
+        event["timestamp"],
+        event["message"],
+        event["ingestionTime"],
+        event.get("eventId", ""),
+    )
@@ -1,4 +1,4 @@
-from ecsctl.utils import filter_empty_values
+from ecsctl.utils import LazyList, filter_empty_values
 from ecsctl.models.task import (
     ContainerOverride,
     InferenceAcceleratorOverride,
@@ -104,18 +104,9 @@ def deserialize_container(container: Dict[str, Any]) -> Container:
         container["cpu"],
         container.get("memory", None),
         container.get("memoryReservation", None),
-        [
-            deserialize_network_binding(binding)
-            for binding in container.get("networkBindings", [])
-        ],
-        [
-            deserialize_network_interface(interface)
-            for interface in container.get("networkInterfaces", [])
-        ],
-        [
-            deserialize_managed_agent(agent)
-            for agent in container.get("managedAgents", [])
-        ],
+        LazyList(container.get("networkBindings", []), deserialize_network_binding),
+        LazyList(container.get("networkInterfaces", []), deserialize_network_interface),
+        LazyList(container.get("managedAgents", []), deserialize_managed_agent),
         container.get("gpuIds", []),
     )
 
@@ -201,10 +192,7 @@ def deserialize_task_override(task_override: Dict[str, Any]) -> TaskOverride:
     inference_overrides = task_override.get("inferenceAcceleratorOverrides", None)
     return TaskOverride(
         (
-            [
-                deserialize_container_overrides(override)
-                for override in container_overrides
-            ]
+            LazyList(container_overrides, deserialize_container_overrides)
             if container_overrides is not None
             else None
         ),
@@ -214,7 +202,7 @@ def deserialize_task_override(task_override: Dict[str, Any]) -> TaskOverride:
                 deserialize_inference_accelerator_override(override)
                 for override in inference_overrides
             ]
-            if container_overrides is not None
+            if inference_overrides is not None
             else None
         ),
     )
@@ -285,11 +273,8 @@ def deserialize_task(task: Dict[str, Any]) -> Task:
         task.get("stoppedAt", None),
         task.get("stoppedReason", ""),
         task["tags"],
-        [deserialize_container(container) for container in task["containers"]],
-        [
-            deserialize_attachment(attachment)
-            for attachment in task.get("attachments", [])
-        ],
+        LazyList(task["containers"], deserialize_container),
+        LazyList(task.get("attachments", []), deserialize_attachment),
         deserialize_task_override(overrides) if overrides is not None else None,
     )
 
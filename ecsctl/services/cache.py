@@ -0,0 +1,376 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+from datetime import datetime
+from ecsctl.models import CacheStats
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DATETIME_TAG = "$datetime"
+REVISION_REGEX = r"^(arn:[^/]+:task-definition/)?[A-Za-z0-9_-]+:\d+$"
+
+
+def cache_home() -> Path:
+    home = os.environ["HOME"]
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", f"{home}/.cache")
+
+    return Path(f"{xdg_cache}/ecs-ctl")
+
+
+def encode(value: Any) -> bytes:
+    def encode_default(item: Any) -> Any:
+        if isinstance(item, datetime):
+            return {DATETIME_TAG: item.isoformat()}
+        raise TypeError(f"Can't cache value of type {type(item).__name__}")
+
+    data = json.dumps(value, default=encode_default, separators=(",", ":"))
+    return zlib.compress(data.encode("utf-8"))
+
+
+def decode(data: bytes) -> Any:
+    def decode_hook(item: Dict[str, Any]) -> Any:
+        if len(item) == 1 and DATETIME_TAG in item:
+            return datetime.fromisoformat(item[DATETIME_TAG])
+        return item
+
+    return json.loads(zlib.decompress(data).decode("utf-8"), object_hook=decode_hook)
+
+
+class DiskCache:
+    """
+    A directory of compressed JSON entries, one file per key. Reading an entry marks
+    it as recently used and the least recently used entries are evicted once the
+    directory grows past max_bytes.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats_path = path.with_name(f"{path.name}.stats.json")
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def read_stats(self) -> Dict[str, int]:
+        try:
+            return json.loads(self.stats_path.read_text())
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def save_stats(self):
+        """Add this process' hits and misses to the totals kept next to the cache."""
+        if self.hits == 0 and self.misses == 0:
+            return
+
+        stats = self.read_stats()
+        stats["hits"] = stats.get("hits", 0) + self.hits
+        stats["misses"] = stats.get("misses", 0) + self.misses
+
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            self.stats_path.write_text(json.dumps(stats))
+            self.hits = self.misses = 0
+        except OSError:
+            pass
+
+    def size(self) -> Tuple[int, int]:
+        """The number of entries in the cache and their size in bytes."""
+        if not self.path.exists():
+            return (0, 0)
+
+        sizes = [entry.stat().st_size for entry in self.path.iterdir()]
+        return (len(sizes), sum(sizes))
+
+    def file_for(self, key: str) -> Path:
+        return self.path / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        file = self.file_for(key)
+
+        try:
+            data = file.read_bytes()
+            os.utime(file)
+        except OSError:
+            # Missing, or e.g. owned by another user or in a read-only directory
+            return None
+
+        try:
+            return decode(data)
+        except (ValueError, zlib.error):
+            file.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, value: Any):
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile(
+                dir=self.path, prefix=".", delete=False
+            ) as temp_file:
+                temp_file.write(encode(value))
+
+            os.replace(temp_file.name, self.file_for(key))
+            self.evict()
+        except OSError:
+            # Caching is an optimisation, never fail a command because of it
+            pass
+
+    def evict(self):
+        entries = [(entry, entry.stat()) for entry in self.path.iterdir()]
+        entries = sorted(entries, key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+
+        for entry, stat in entries:
+            if total <= self.max_bytes:
+                break
+
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self):
+        if not self.path.exists():
+            return
+
+        for entry in self.path.iterdir():
+            entry.unlink(missing_ok=True)
+
+    def stats(self) -> CacheStats:
+        entries, size = self.size()
+        totals = self.read_stats()
+        hits = totals.get("hits", 0) + self.hits
+        misses = totals.get("misses", 0) + self.misses
+
+        return CacheStats(
+            self.path.name,
+            entries,
+            size,
+            hits,
+            misses,
+            f"{hits / (hits + misses):.0%}" if hits + misses > 0 else "-",
+        )
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+        self.stats_path.unlink(missing_ok=True)
+
+
+class TaskDefinitionCache(DiskCache):
+    """
+    Cache of describe_task_definition responses. A revision, either a full ARN or
+    family:revision, can never change so its entries never expire. Lookups by
+    family:revision are scoped to the namespace, the profile and region they were
+    made in, as they don't identify an account on their own.
+    """
+
+    DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        namespace: str,
+        path: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        super().__init__(path or cache_home() / "task-definitions", max_bytes)
+        self.namespace = namespace
+
+    @staticmethod
+    def is_revision(definition_family_rev_or_arn: str) -> bool:
+        return re.match(REVISION_REGEX, definition_family_rev_or_arn) is not None
+
+    def key_for(self, definition_family_rev_or_arn: str) -> str:
+        if definition_family_rev_or_arn.startswith("arn:"):
+            return definition_family_rev_or_arn
+        return f"{self.namespace}/{definition_family_rev_or_arn}"
+
+    def get_definition(
+        self, definition_family_rev_or_arn: str
+    ) -> Optional[Dict[str, Any]]:
+        if not self.is_revision(definition_family_rev_or_arn):
+            return None
+
+        definition = self.get(self.key_for(definition_family_rev_or_arn))
+        self.record(hit=definition is not None)
+        return definition
+
+    def put_definition(
+        self, definition_family_rev_or_arn: str, definition: Dict[str, Any]
+    ):
+        arn = definition["taskDefinitionArn"]
+        self.put(arn, definition)
+
+        if definition_family_rev_or_arn != arn and self.is_revision(
+            definition_family_rev_or_arn
+        ):
+            self.put(self.key_for(definition_family_rev_or_arn), definition)
+
+
+class CredentialCache(DiskCache):
+    """
+    Temporary credentials resolved for assume-role and SSO profiles, so they are
+    reused across invocations instead of calling STS or SSO every time. It stands in
+    for botocore's in-memory credential cache, which refreshes entries well before
+    they expire. The directory is only accessible to the current user and every
+    entry is written with 0600 permissions.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        profile: str,
+        path: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        super().__init__(path or cache_home() / "credentials", max_bytes)
+        self.profile = profile
+
+    def key_for(self, key: str) -> str:
+        return f"{self.profile}/{key}"
+
+    def put(self, key: str, value: Any):
+        try:
+            self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self.path.chmod(0o700)
+        except OSError:
+            return
+
+        # Entries are written through NamedTemporaryFile, which creates them as 0600
+        super().put(key, value)
+
+    def __contains__(self, key: str) -> bool:
+        found = self.file_for(self.key_for(key)).exists()
+        if not found:
+            self.record(hit=False)
+        return found
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        response = self.get(self.key_for(key))
+        self.record(hit=response is not None)
+
+        if response is None:
+            raise KeyError(key)
+        return response
+
+    def __setitem__(self, key: str, response: Dict[str, Any]):
+        self.put(self.key_for(key), response)
+
+    def __delitem__(self, key: str):
+        self.file_for(self.key_for(key)).unlink(missing_ok=True)
+
+
+class ResponseCache(DiskCache):
+    """
+    Short lived cache of list_* and describe_* responses, so commands chained in an
+    interactive session don't all list and describe the same resources again. Each
+    resource type has its own time to live and any mutating call clears the cache,
+    even when reading from it is disabled.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    TTLS = {
+        "clusters": 60,
+        "container_instances": 30,
+        "services": 15,
+        "tasks": 5,
+    }
+    MUTATING_PREFIXES = (
+        "create_",
+        "delete_",
+        "deregister_",
+        "put_",
+        "register_",
+        "run_",
+        "start_",
+        "stop_",
+        "submit_",
+        "tag_",
+        "untag_",
+        "update_",
+    )
+
+    def __init__(
+        self,
+        namespace: str,
+        enabled: bool = True,
+        path: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        super().__init__(path or cache_home() / "responses", max_bytes)
+        self.namespace = namespace
+        self.enabled = enabled
+
+    def ttl_for(self, operation: str) -> Optional[int]:
+        for prefix in ("list_", "describe_"):
+            if operation.startswith(prefix):
+                return self.TTLS.get(operation[len(prefix) :], None)
+
+        return None
+
+    def key_for(self, operation: str, params: Dict[str, Any]) -> str:
+        return json.dumps([self.namespace, operation, params], sort_keys=True)
+
+    def cached_call(
+        self, operation: str, call: Callable[..., Dict[str, Any]], ttl: int
+    ) -> Callable[..., Dict[str, Any]]:
+        def cached(**params: Any) -> Dict[str, Any]:
+            key = self.key_for(operation, params)
+            entry = self.get(key)
+
+            if entry is not None and time.time() - entry["stored_at"] < ttl:
+                self.record(hit=True)
+                return entry["response"]
+
+            self.record(hit=False)
+            response = call(**params)
+            response.pop("ResponseMetadata", None)
+            self.put(key, {"stored_at": time.time(), "response": response})
+
+            return response
+
+        return cached
+
+    def invalidating_call(
+        self, call: Callable[..., Dict[str, Any]]
+    ) -> Callable[..., Dict[str, Any]]:
+        def invalidating(**params: Any) -> Dict[str, Any]:
+            try:
+                return call(**params)
+            finally:
+                self.clear()
+
+        return invalidating
+
+    def wrap(self, client: Any) -> "CachedClient":
+        return CachedClient(client, self)
+
+
+class CachedClient:
+    """A boto3 client proxy that serves list_* and describe_* calls from a cache."""
+
+    def __init__(self, client: Any, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.client, name)
+        ttl = self.cache.ttl_for(name)
+
+        if ttl is not None and self.cache.enabled:
+            return self.cache.cached_call(name, attribute, ttl)
+        elif name.startswith(ResponseCache.MUTATING_PREFIXES):
+            return self.cache.invalidating_call(attribute)
+
+        return attribute
@@ -0,0 +1,135 @@
+import threading
+
+from boto3.session import Session
+from botocore.config import Config
+from botocore.loaders import Loader
+from ecsctl.services.cache import CredentialCache
+from ecsctl.services.service_models import ServiceModelCache
+from ecsctl.services.throttle import RETRY_CONFIG, install_rate_limiter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHED_CREDENTIAL_PROVIDERS = ["assume-role", "assume-role-with-web-identity", "sso"]
+# Long-lived keys, which can change without the profile name changing
+STATIC_CREDENTIAL_METHODS = {
+    "env",
+    "explicit",
+    "shared-credentials-file",
+    "config-file",
+}
+
+
+def install_credential_cache(session: Session, cache: CredentialCache):
+    """Make the session's assume-role and SSO credential providers use cache."""
+    resolver = session._session.get_component("credential_provider")
+
+    for method in CACHED_CREDENTIAL_PROVIDERS:
+        provider = resolver.get_provider(method)
+        provider.cache = cache
+
+
+class ClientFactory:
+    """
+    Hands out cached boto3 clients, e.g. ecs, logs, ec2 or ssm, one per
+    (profile, region, service). Every profile shares a single session, so
+    credentials and service models are only resolved once, and every client keeps
+    a keep-alive connection pool large enough for the configured number of workers.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int,
+        credential_cache: Optional[Callable[[str], CredentialCache]] = None,
+        model_cache: Optional[ServiceModelCache] = None,
+    ):
+        self.config = RETRY_CONFIG.merge(
+            Config(max_pool_connections=max_pool_connections, tcp_keepalive=True)
+        )
+        self.sessions: Dict[Optional[str], Session] = {}
+        self.clients: Dict[Tuple[Optional[str], Optional[str], str], Any] = {}
+        self.session_locks: Dict[Optional[str], threading.Lock] = {}
+        self.lock = threading.Lock()
+        self.credential_cache = credential_cache
+        self.model_cache = model_cache
+        self.loader: Optional[Loader] = None
+
+    def session_lock(self, profile: Optional[str]) -> threading.Lock:
+        with self.lock:
+            return self.session_locks.setdefault(profile, threading.Lock())
+
+    def session(self, profile: Optional[str] = None) -> Session:
+        with self.session_lock(profile):
+            return self.create_session(profile)
+
+    def create_session(self, profile: Optional[str]) -> Session:
+        if profile not in self.sessions:
+            # Setting a session up registers a few hundred event handlers, so regions
+            # share it and only pick their region when creating a client.
+            session = Session(profile_name=profile)
+            self.share_loader(session)
+
+            if self.credential_cache is not None:
+                cache = self.credential_cache(session.profile_name)
+                install_credential_cache(session, cache)
+
+            self.sessions[profile] = session
+
+        return self.sessions[profile]
+
+    def share_loader(self, session: Session):
+        """
+        Let every session use the loader of the first one, so service models,
+        endpoints and rulesets are loaded and parsed once rather than per session.
+        """
+        with self.lock:
+            if self.loader is None:
+                self.loader = session._session.get_component("data_loader")
+
+                if self.model_cache is not None:
+                    self.model_cache.install(self.loader)
+            else:
+                session._session.register_component("data_loader", self.loader)
+
+    def client(
+        self,
+        service: str,
+        profile: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> Any:
+        # Sessions aren't thread-safe, so clients of one session are created one
+        # at a time while other profiles can be set up in parallel. The clients
+        # themselves are thread-safe once created.
+        with self.session_lock(profile):
+            key = (profile, region, service)
+
+            if key not in self.clients:
+                session = self.create_session(profile)
+                client = session.client(service, region_name=region, config=self.config)
+                install_rate_limiter(client, session.profile_name)
+                self.clients[key] = client
+
+            return self.clients[key]
+
+    def close(self):
+        """Close the connection pools of every client handed out so far."""
+        with self.lock:
+            clients = list(self.clients.values())
+            self.clients.clear()
+
+        for client in clients:
+            client.close()
+
+    def identity(self, profile: Optional[str] = None) -> str:
+        """
+        Who calls made with profile are made as, e.g. to scope caches by: the name of
+        the profile the session resolved to and, for static credentials such as
+        AWS_ACCESS_KEY_ID, their access key id. The credentials were already
+        resolved when the profile's first client was created.
+        """
+        with self.session_lock(profile):
+            session = self.create_session(profile)
+            credentials = session.get_credentials()
+
+        if credentials is not None and credentials.method in STATIC_CREDENTIAL_METHODS:
+            return f"{session.profile_name}:{credentials.access_key}"
+
+        return session.profile_name
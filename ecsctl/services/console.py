@@ -1,13 +1,13 @@
 import functools
+import json
 import os
 import sys
 import stat
+import threading
 
 from datetime import datetime
 from enum import Enum
-from tabulate import tabulate
-from typing import Any, List, Optional, Tuple
-from simple_term_menu import TerminalMenu
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
 
 
 def render_column(item: Any) -> str:
@@ -28,6 +28,75 @@ class Color(Enum):
         return str(self.value)
 
 
+class LogWriter:
+    """
+    Writes log lines, each behind the pre-rendered prefix of its stream, in batches
+    rather than with a write and flush per line. A batch is written once it holds
+    MAX_BATCH_BYTES or its first line has waited MAX_BATCH_DELAY seconds.
+    """
+
+    MAX_BATCH_BYTES = 64 * 1024
+    MAX_BATCH_DELAY = 0.1
+
+    def __init__(self, output: TextIO, prefixes: Dict[str, str]):
+        self.output = output
+        self.prefixes = prefixes
+        self.batch: List[str] = []
+        self.size = 0
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        self.broken = False
+
+    def __enter__(self) -> "LogWriter":
+        return self
+
+    def __exit__(self, *args: Any):
+        self.flush()
+
+    def write(self, stream_name: str, message: str) -> bool:
+        """Add a line to the batch, returning False once the reader went away."""
+        line = f"{self.prefixes.get(stream_name, '')}{message}\n"
+
+        with self.lock:
+            self.batch.append(line)
+            self.size += len(line)
+
+            if self.size >= self.MAX_BATCH_BYTES:
+                self.write_batch()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.MAX_BATCH_DELAY, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+            return not self.broken
+
+    def flush(self):
+        with self.lock:
+            self.write_batch()
+
+    def write_batch(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        batch, self.batch, self.size = self.batch, [], 0
+        if len(batch) == 0 or self.broken:
+            return
+
+        try:
+            self.output.write("".join(batch))
+            self.output.flush()
+        except BrokenPipeError:
+            # The reader, e.g. head, has exited. Point the output at /dev/null, so
+            # flushing it again on exit doesn't fail with another BrokenPipeError.
+            self.broken = True
+            try:
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, self.output.fileno())
+            except (OSError, ValueError):
+                pass
+
+
 class Console:
     def input(self, message: str) -> str:
         return input(message)
@@ -36,28 +105,61 @@ class Console:
         reset = Color._RESET if color is not None else None
         print(f"{color or ''}{message}{reset or ''}", flush=self.is_output_redirected())
 
-    def table(self, items: List[Any]):
+    def debug(self, message: Any):
+        print(message, file=sys.stderr, flush=True)
+
+    def log_writer(self, prefixes: Dict[str, str]) -> LogWriter:
+        return LogWriter(sys.stdout, prefixes)
+
+    def print_json_array(self, items: Iterable[Any]):
+        """Print a JSON array one element at a time, as the items become available."""
+        separator = "["
+        for item in items:
+            print(f"{separator}{json.dumps(item)}", end="", flush=True)
+            separator = ", "
+
+        print("]" if separator != "[" else "[]", flush=self.is_output_redirected())
+
+    def table(self, items: List[Any], origins: Optional[List[Dict[str, str]]] = None):
+        """
+        Render items as a table of their DEFAULT_COLUMNS. When origins are given, each
+        item is prefixed with the matching origin's values, e.g. a CLUSTER column.
+        """
         if len(items) == 0:
             print("No items found.")
             return
 
         first = items[0]
+        origins = origins or [{} for _ in items]
+        origin_columns = list(origins[0].keys())
 
         table_headers = [
-            head.upper().replace("_", " ") for head in first.__class__.DEFAULT_COLUMNS
+            head.upper().replace("_", " ")
+            for head in origin_columns + first.__class__.DEFAULT_COLUMNS
         ]
         table_body = [
-            [
+            [render_column(origin[name]) for name in origin_columns]
+            + [
                 render_column(row.__dict__[name])
                 for name in row.__class__.DEFAULT_COLUMNS
             ]
-            for row in items
+            for row, origin in zip(items, origins, strict=True)
         ]
 
+        self.print_table(table_headers, table_body)
+
+    def print_table(self, headers: List[str], body: List[List[Any]]):
+        """Render already extracted rows under the given headers."""
+        if len(body) == 0:
+            print("No items found.")
+            return
+
+        from tabulate import tabulate
+
         print(
             tabulate(
-                table_body,
-                headers=table_headers,
+                body,
+                headers=headers,
                 tablefmt="plain",
                 numalign="left",
                 stralign="left",
@@ -66,7 +168,13 @@ class Console:
 
     @functools.lru_cache(maxsize=1)
     def is_output_redirected(self) -> bool:
-        if os.isatty(sys.stdout.fileno()):
+        try:
+            fileno = sys.stdout.fileno()
+        except (OSError, ValueError):
+            # Not backed by a file descriptor, e.g. an in-memory buffer
+            return True
+
+        if os.isatty(fileno):
             return False
         else:
             mode = os.fstat(1).st_mode
@@ -81,6 +189,8 @@ class Console:
         if self.is_output_redirected():
             raise Exception("Can't render selection when output is redirected!")
 
+        from simple_term_menu import TerminalMenu
+
         terminal_menu = TerminalMenu(options, title=title)
         index = terminal_menu.show()
         return (options[index], index)
@@ -1,6 +1,16 @@
-import boto3
-
-from typing import Any, List, Literal, Optional
+import threading
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+)
 from ecsctl.models import Cluster, Instance, Service, Event, Task, TaskDefinition
 from ecsctl.serializers import (
     deserialize_instance,
@@ -9,143 +19,223 @@ from ecsctl.serializers import (
     deserialize_cluster,
     deserialize_task_definition,
 )
-from ecsctl.utils import chunks
+from ecsctl.services.cache import ResponseCache, TaskDefinitionCache
+from ecsctl.utils import chunked, parallel_imap, prefetch
+
+T = TypeVar("T")
+
+ClusterField = Literal[
+    "ATTACHMENTS", "CONFIGURATIONS", "SETTINGS", "STATISTICS", "TAGS"
+]
+
+InstanceStatus = Literal[
+    "ALL",
+    "ACTIVE",
+    "DRAINING",
+    "REGISTERING",
+    "DEREGISTERING",
+    "REGISTRATION_FAILED",
+]
+
+
+def paginate(
+    operation: Callable[..., Dict[str, Any]], result_key: str, **kwargs: Any
+) -> Generator[List[str], None, None]:
+    """Yield every page of a paginated list_* call, following nextToken iteratively."""
+    while True:
+        response = operation(**kwargs)
+        yield response[result_key]
+
+        next_token = response.get("nextToken", None)
+        if next_token is None:
+            return
+
+        kwargs["nextToken"] = next_token
+
+
+class BoundedClient:
+    """
+    A boto3 client proxy that holds a slot of calls for the duration of every call,
+    so nested fan-out, e.g. clusters and their describe calls, or several targets
+    sharing the same semaphore never have more calls in flight than it allows.
+    """
+
+    def __init__(self, client: Any, calls: threading.Semaphore):
+        self.client = client
+        self.calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.client, name)
+
+        if not callable(attribute):
+            return attribute
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self.calls:
+                return attribute(*args, **kwargs)
+
+        return call
 
 
 class EcsService:
-    def __init__(self, profile: str = None, region: str = None):
-        session = boto3.session.Session(
-            profile_name=profile,
-            region_name=region,
+    DEFAULT_CONCURRENCY = 8
+    PREFETCH_PAGES = 4
+    CLUSTER_DETAILS: List[ClusterField] = [
+        "ATTACHMENTS",
+        "SETTINGS",
+        "STATISTICS",
+        "TAGS",
+    ]
+
+    def __init__(
+        self,
+        client: Any,
+        concurrency: Optional[int] = None,
+        definition_cache: Optional[TaskDefinitionCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        calls: Optional[threading.Semaphore] = None,
+    ):
+        self.concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        # Cache hits don't count towards the calls in flight
+        client = BoundedClient(
+            client, calls or threading.BoundedSemaphore(self.concurrency)
+        )
+        self.client = (
+            response_cache.wrap(client) if response_cache is not None else client
+        )
+        self.definition_cache = definition_cache
+
+    def list_arns(
+        self, operation: str, result_key: str, queries: List[Dict[str, Any]]
+    ) -> Generator[str, None, None]:
+        pages: Iterable[List[str]] = (
+            page
+            for query in queries
+            for page in paginate(
+                getattr(self.client, operation), result_key, maxResults=100, **query
+            )
         )
 
-        self.client = session.client("ecs")
+        # Pipeline the list calls: keep paging on a background thread so the
+        # describe calls for one page overlap with listing the next ones.
+        if self.concurrency > 1:
+            pages = prefetch(pages, self.PREFETCH_PAGES)
 
-    def get_clusters(self, cluster_names: List[str]) -> List[Cluster]:
-        cluster_arns = (
-            cluster_names
-            if len(cluster_names) > 0
-            else self.client.list_clusters()["clusterArns"]
+        for page in pages:
+            yield from page
+
+    def describe_all(
+        self,
+        describe: Callable[[List[str]], List[T]],
+        arns: Iterable[str],
+        chunk_size: int,
+    ) -> Generator[T, None, None]:
+        for described in parallel_imap(
+            describe, chunked(arns, chunk_size), self.concurrency
+        ):
+            yield from described
+
+    def iter_clusters(
+        self,
+        cluster_names: List[str],
+        include: Optional[List[ClusterField]] = None,
+    ) -> Generator[Cluster, None, None]:
+        cluster_arns: Iterable[str] = (
+            self.list_arns("list_clusters", "clusterArns", [{}])
+            if len(cluster_names) == 0
+            else cluster_names
         )
-        descriptors = self.client.describe_clusters(clusters=cluster_arns)
-        clusters = [deserialize_cluster(cluster) for cluster in descriptors["clusters"]]
 
-        return clusters
+        def describe_clusters(clusters_chunk: List[str]) -> List[Cluster]:
+            args: Dict[str, Any] = {"clusters": clusters_chunk}
 
-    def get_instances(
+            if include:
+                args["include"] = include
+
+            descriptor = self.client.describe_clusters(**args)
+
+            return [deserialize_cluster(cluster) for cluster in descriptor["clusters"]]
+
+        yield from self.describe_all(describe_clusters, cluster_arns, 100)
+
+    def get_clusters(
+        self,
+        cluster_names: List[str],
+        include: Optional[List[ClusterField]] = None,
+    ) -> List[Cluster]:
+        """
+        Describe the given clusters, or every cluster in the account. The optional
+        include fields are only fetched when asked for, the counts shown in
+        Cluster.DEFAULT_COLUMNS are always part of the response.
+        """
+        return list(self.iter_clusters(cluster_names, include=include))
+
+    def iter_instances(
         self,
         cluster_name: str,
         instance_names: List[str],
-        status: Optional[
-            Literal[
-                "ALL",
-                "ACTIVE",
-                "DRAINING",
-                "REGISTERING",
-                "DEREGISTERING",
-                "REGISTRATION_FAILED",
-                "INACTIVE",
-            ]
-        ] = None,
-    ) -> List[Instance]:
-        def list_all_instance_arns(
-            next_token: Optional[str] = None, status: Optional[str] = None
-        ):
-            args = {
-                "cluster": cluster_name,
-                "maxResults": 100,
-                "nextToken": next_token or "",
-            }
-
-            if status is not None:
-                args["status"] = status
-
-            response = self.client.list_container_instances(
-                cluster=cluster_name,
-                maxResults=100,
-                nextToken=next_token or "",
-            )
-
-            instance_arns = response["containerInstanceArns"]
-            next_token = response.get("nexttoken", None)
-            return (
-                instance_arns + list_all_instance_arns(next_token, status=status)
-                if next_token is not None
-                else instance_arns
-            )
-
+        status: Optional[InstanceStatus] = None,
+    ) -> Generator[Instance, None, None]:
         if len(instance_names) == 0:
-            instance_arns = [
-                list_all_instance_arns(status=status)
-                if (status or "").upper() != "ALL"
-                else list_all_instance_arns()
-                + list_all_instance_arns(status="INACTIVE")
-            ]
+            # Without a status the API lists instances in every state
+            if status is None or status.upper() == "ALL":
+                queries = [{"cluster": cluster_name}]
+            else:
+                queries = [{"cluster": cluster_name, "status": status.upper()}]
+
+            instance_arns: Iterable[str] = self.list_arns(
+                "list_container_instances", "containerInstanceArns", queries
+            )
         else:
             instance_arns = instance_names
 
-        instance_arns = (
-            list_all_instance_arns() if len(instance_names) == 0 else instance_names
-        )
-
-        instances: List[Instance] = []
-
-        for instance_chunks in chunks(instance_arns, 100):
+        def describe_instances(instance_chunk: List[str]) -> List[Instance]:
             descriptor = self.client.describe_container_instances(
-                cluster=cluster_name, containerInstances=instance_chunks
+                cluster=cluster_name, containerInstances=instance_chunk
             )
 
-            instances = instances + [
+            return [
                 deserialize_instance(instance)
                 for instance in descriptor["containerInstances"]
             ]
 
-        return instances
+        yield from self.describe_all(describe_instances, instance_arns, 100)
 
-    def get_services(self, cluster: str, service_names: List[str]) -> List[Service]:
-        def list_all_service_arns(next_token=None):
-            response = self.client.list_services(
-                cluster=cluster, maxResults=100, nextToken=next_token or ""
-            )
-
-            service_arns = response["serviceArns"]
-            next_token = response.get("nextToken", None)
-
-            return (
-                service_arns + list_all_service_arns(next_token)
-                if next_token is not None
-                else service_arns
-            )
-
-        service_arns = (
-            list_all_service_arns() if len(service_names) == 0 else service_names
+    def get_instances(
+        self,
+        cluster_name: str,
+        instance_names: List[str],
+        status: Optional[InstanceStatus] = None,
+    ) -> List[Instance]:
+        return list(self.iter_instances(cluster_name, instance_names, status=status))
+
+    def iter_services(
+        self, cluster: str, service_names: List[str]
+    ) -> Generator[Service, None, None]:
+        service_arns: Iterable[str] = (
+            self.list_arns("list_services", "serviceArns", [{"cluster": cluster}])
+            if len(service_names) == 0
+            else service_names
         )
 
-        services: List[Service] = []
-
-        for services_chunk in chunks(service_arns, 10):
+        def describe_services(services_chunk: List[str]) -> List[Service]:
             descriptor = self.client.describe_services(
                 cluster=cluster, services=services_chunk
             )
 
-            services = services + [
-                deserialize_service(service) for service in descriptor["services"]
-            ]
+            return [deserialize_service(service) for service in descriptor["services"]]
 
-        return services
+        yield from self.describe_all(describe_services, service_arns, 10)
 
-    def get_events_for_service(self, cluster: str, service_name: str) -> List[Event]:
-        descriptor = self.client.describe_services(
-            cluster=cluster, services=[service_name]
-        )
-        services: List[Any] = descriptor["services"]
+    def get_services(self, cluster: str, service_names: List[str]) -> List[Service]:
+        return list(self.iter_services(cluster, service_names))
 
-        if len(services) > 0:
-            service = deserialize_service(descriptor["services"][0])
+    def get_events_for_service(self, cluster: str, service_name: str) -> List[Event]:
+        service = next(self.iter_services(cluster, [service_name]), None)
 
         return service.events if service is not None else []
 
-    def get_tasks(
+    def iter_tasks(
         self,
         cluster: str,
         task_names_or_arns: Optional[List[str]] = None,
@@ -153,55 +243,63 @@ class EcsService:
         service: Optional[str] = None,
         family: Optional[str] = None,
         status: str = "RUNNING",
-    ) -> List[Task]:
-        def list_all_task_arns(next_token=None, desired_status: str = "RUNNING"):
-            args = {
-                "cluster": cluster,
-                "maxResults": 100,
-                "desiredStatus": desired_status,
-                "nextToken": next_token or "",
-            }
+    ) -> Generator[Task, None, None]:
+        if len(task_names_or_arns or []) == 0:
+            query: Dict[str, Any] = {"cluster": cluster}
 
             if instance is not None:
-                args["containerInstance"] = instance
+                query["containerInstance"] = instance
 
             if service is not None:
-                args["serviceName"] = service
+                query["serviceName"] = service
 
             if family is not None:
-                args["family"] = family
-
-            response = self.client.list_tasks(**args)
+                query["family"] = family
 
-            task_arns = response["taskArns"]
-            next_token = response.get("nextToken", None)
-
-            return (
-                task_arns + list_all_task_arns(next_token)
-                if next_token is not None
-                else task_arns
+            desired_statuses = (
+                [status.upper()] if status.upper() != "ALL" else ["RUNNING", "STOPPED"]
             )
 
-        if len(task_names_or_arns or []) == 0:
-            task_arns = (
-                list_all_task_arns(desired_status=status.upper())
-                if status.upper() != "ALL"
-                else list_all_task_arns(desired_status="RUNNING")
-                + list_all_task_arns(desired_status="STOPPED")
+            task_arns: Iterable[str] = self.list_arns(
+                "list_tasks",
+                "taskArns",
+                [
+                    {**query, "desiredStatus": desired_status}
+                    for desired_status in desired_statuses
+                ],
             )
         else:
-            task_arns = task_names_or_arns
-
-        tasks: List[Task] = []
+            task_arns = task_names_or_arns or []
 
-        for tasks_chunk in chunks(task_arns, 100):
+        def describe_tasks(tasks_chunk: List[str]) -> List[Task]:
             descriptor = self.client.describe_tasks(
                 cluster=cluster,
                 tasks=tasks_chunk,
             )
 
-            tasks = tasks + [deserialize_task(task) for task in descriptor["tasks"]]
-        return tasks
+            return [deserialize_task(task) for task in descriptor["tasks"]]
+
+        yield from self.describe_all(describe_tasks, task_arns, 100)
+
+    def get_tasks(
+        self,
+        cluster: str,
+        task_names_or_arns: Optional[List[str]] = None,
+        instance: Optional[str] = None,
+        service: Optional[str] = None,
+        family: Optional[str] = None,
+        status: str = "RUNNING",
+    ) -> List[Task]:
+        return list(
+            self.iter_tasks(
+                cluster,
+                task_names_or_arns=task_names_or_arns,
+                instance=instance,
+                service=service,
+                family=family,
+                status=status,
+            )
+        )
 
     def get_containers(self, cluster: str, task_name):
         task = self.get_task_by_id_or_arn(cluster, task_id_or_arn=task_name)
@@ -216,9 +314,21 @@ class EcsService:
         return deserialize_task(descriptor["tasks"][0])
 
     def get_task_definition(self, definition_family_rev_or_arn: str) -> TaskDefinition:
+        if self.definition_cache is not None:
+            cached = self.definition_cache.get_definition(definition_family_rev_or_arn)
+
+            if cached is not None:
+                return deserialize_task_definition(cached)
+
         descriptor = self.client.describe_task_definition(
             taskDefinition=definition_family_rev_or_arn
         )
+
+        if self.definition_cache is not None:
+            self.definition_cache.put_definition(
+                definition_family_rev_or_arn, descriptor["taskDefinition"]
+            )
+
         return deserialize_task_definition(descriptor["taskDefinition"])
 
     def redeploy_service(self, cluster: str, service: str):
@@ -1,14 +1,24 @@
-from ecsctl.serializers.serialize_log import deserialize_log_line
+from ecsctl.serializers.serialize_log import (
+    deserialize_log_line,
+    deserialize_stream_event,
+)
+import heapq
+import json
+import math
+import random
+import tempfile
 import re
+import threading
 import time
 
-from boto3.session import Session
-from ecsctl.models.log import LogLine
 from collections import deque
+
+from ecsctl.models.log import LogLine
+from ecsctl.utils import BoundedSet, chunks, parallel_imap, parallel_map, prefetch
 from datetime import datetime, timedelta
 from dateutil.parser import parse
 from dateutil.tz import tzutc
-from typing import Generator, List, Optional, Union
+from typing import IO, Any, Deque, Dict, Generator, Iterable, List, Optional
 
 
 ONE_MINUTE = 60
@@ -18,18 +28,89 @@ ONE_WEEK = 7 * ONE_DAY
 
 TIMINGS = {"m": ONE_MINUTE, "h": ONE_HOUR, "d": ONE_DAY, "w": ONE_WEEK}
 
+REGEX_SPECIAL_CHARACTERS = set(".^$*+?{}[]\\|()")
+
+
+def server_side_pattern(regex: re.Pattern) -> Optional[str]:
+    """
+    The CloudWatch Logs filter pattern matching the same messages as regex, which
+    is only possible for plain, case-sensitive text, optionally with escaped
+    punctuation, e.g. java\\.lang. None when it has to be matched client-side.
+    """
+    if regex.pattern == "" or regex.flags & re.IGNORECASE:
+        return None
+
+    text = ""
+    characters = iter(regex.pattern)
+    for character in characters:
+        if character == "\\":
+            character = next(characters, "")
+            if character == "" or character.isalnum():
+                return None
+        elif character in REGEX_SPECIAL_CHARACTERS:
+            return None
+
+        text += character
+
+    if '"' in text:
+        return None
+
+    # A quoted term matches messages that contain it anywhere
+    return '"' + text + '"'
+
+
+class PollInterval:
+    """
+    How long to wait between polls, e.g. of a tail: halved after every poll that
+    delivered lines, down to minimum, and backed off towards maximum while nothing
+    new comes in. Every wait is jittered so parallel pollers don't run in lockstep.
+    """
+
+    BACKOFF = 1.5
+
+    def __init__(self, minimum: float, maximum: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = minimum
+
+    def next(self, lines: int) -> float:
+        if lines > 0:
+            self.current = max(self.minimum, self.current / 2)
+        else:
+            self.current = min(self.maximum, self.current * self.BACKOFF)
+
+        return random.uniform(self.current / 2, self.current)
+
 
 class AWSLogs:
-    DEFAULT_TAIL_INTERVAL = 5
+    MIN_TAIL_INTERVAL = 2.0
+    MAX_TAIL_INTERVAL = 20.0
+    # How far back to read without --start, tailing only needs a little context
+    DEFAULT_WINDOW = ONE_HOUR
+    DEFAULT_TAIL_WINDOW = ONE_MINUTE
+    MIN_QUERY_INTERVAL = 0.25
+    MAX_QUERY_INTERVAL = 5.0
+    QUERY_FAILED_STATUSES = {"Failed", "Cancelled", "Timeout", "Unknown"}
+    MAX_QUERY_LENGTH = 10000
     MAX_EVENTS_PER_CALL = 10000
+    MAX_STREAMS_PER_CALL = 100
+    # Lines read ahead of the caller, which caps memory when the output is slow
+    PREFETCH_LINES = 10000
+    # Lines of a partition kept in memory before spilling to a temporary file
+    SPOOL_BYTES = 1024 * 1024
     TIME_AGO_REGEX = (
         r"(\d+)\s?(m|minute|minutes|h|hour|hours|d|day|days|w|weeks|weeks)(?: ago)?"
     )
 
-    def __init__(self, session: Session):
-        self.session = session
-        self.client = session.client("logs")
-        self.tail_interval = self.DEFAULT_TAIL_INTERVAL
+    def __init__(self, client: Any, concurrency: int = 1):
+        self.client = client
+        self.concurrency = concurrency
+        self.calls = threading.BoundedSemaphore(max(1, concurrency))
+
+        self.stats_lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.api_calls = 0
+        self.lines_delivered = 0
 
     def query_logs(
         self,
@@ -38,56 +119,442 @@ class AWSLogs:
         start_time: Optional[str],
         end_time: Optional[str],
         tail: bool = False,
+        lines: Optional[int] = None,
+        filter_pattern: Optional[str] = None,
+        grep: Optional[re.Pattern] = None,
+        partitions: int = 1,
     ) -> Generator[LogLine, None, None]:
+        """
+        Yield the log lines of the given streams in timestamp order. The streams are
+        split into groups, each fetched on a call chain of its own in parallel, and
+        the results are merged.
+
+        Without a start time only the last DEFAULT_WINDOW seconds are read, or
+        DEFAULT_TAIL_WINDOW when tailing. With lines, the last lines events of every
+        stream are read instead, and tailing carries on after the newest of them.
+
+        filter_pattern is passed to filter_log_events as is. Lines matching grep are
+        filtered server-side as well where it's plain text, and client-side with the
+        regex otherwise. get_log_events doesn't filter, so with lines, only grep can
+        be used and the last lines are filtered client-side.
+
+        With partitions, a range that isn't tailed is split into that many time
+        windows which are read in parallel, see read_partitioned.
+
+        With a concurrency above one, lines are read on a background thread into a
+        bounded buffer, so fetching overlaps with whatever the caller does with them.
+        Partitioned reads are read ahead into their windows already. Close the
+        generator when stopping early, so no more windows are read.
+        """
         start_timestamp = self.parse_time_ago(start_time)
         end_timestamp = self.parse_time_ago(end_time)
 
-        do_wait = object()
+        if grep is not None and filter_pattern is None and lines is None:
+            filter_pattern = server_side_pattern(grep)
+            if filter_pattern is not None:
+                grep = None
+
+        if partitions > 1 and not tail and lines is None:
+            now = int(time.time() * 1000)
+            log_lines = self.read_partitioned(
+                group_name,
+                stream_names,
+                (
+                    start_timestamp
+                    if start_timestamp is not None
+                    else now - self.DEFAULT_WINDOW * 1000
+                ),
+                end_timestamp if end_timestamp is not None else now,
+                partitions,
+                filter_pattern,
+            )
+        else:
+            log_lines = self.read_logs(
+                group_name,
+                stream_names,
+                start_timestamp,
+                end_timestamp,
+                tail,
+                lines,
+                filter_pattern,
+            )
+
+        if grep is not None:
+            log_lines = (line for line in log_lines if grep.search(line.message))
+
+        # A background thread waiting for a window couldn't close read_partitioned
+        if self.concurrency > 1 and partitions <= 1:
+            log_lines = prefetch(log_lines, self.PREFETCH_LINES)
+
+        return log_lines
+
+    def read_logs(
+        self,
+        group_name: str,
+        stream_names: List[str],
+        start_timestamp: Optional[int],
+        end_timestamp: Optional[int],
+        tail: bool,
+        lines: Optional[int],
+        filter_pattern: Optional[str],
+        stopped: Optional[threading.Event] = None,
+    ) -> Generator[LogLine, None, None]:
+        kwargs: Dict[str, Any] = {"logGroupName": group_name}
+
+        if lines is not None:
+            read_at = int(time.time() * 1000)
+            last_lines = self.last_lines(group_name, stream_names, lines)
+            self.count_lines(len(last_lines))
+            yield from last_lines
+
+            if not tail:
+                return
+
+            start_timestamp = max(
+                (line.timestamp + 1 for line in last_lines), default=read_at
+            )
+        elif start_timestamp is None:
+            window = self.DEFAULT_TAIL_WINDOW if tail else self.DEFAULT_WINDOW
+            start_timestamp = int((time.time() - window) * 1000)
+
+        kwargs["startTime"] = start_timestamp
+
+        if filter_pattern is not None:
+            kwargs["filterPattern"] = filter_pattern
+
+        if end_timestamp is not None:
+            kwargs["endTime"] = end_timestamp
+
+        requests = [
+            {**kwargs, "logStreamNames": group}
+            for group in self.group_streams(stream_names)
+        ]
+
+        seen_event_ids = [BoundedSet[str](self.MAX_EVENTS_PER_CALL) for _ in requests]
+        interval = PollInterval(self.MIN_TAIL_INTERVAL, self.MAX_TAIL_INTERVAL)
+
+        while True:
+            pages = [
+                self.fetch_pages(request, seen, stopped)
+                for request, seen in zip(requests, seen_event_ids, strict=True)
+            ]
+
+            if len(pages) == 1:
+                log_lines: Iterable[LogLine] = pages[0]
+            else:
+                # Each stream comes back in timestamp order, so a k-way merge of
+                # them keeps the order a single interleaved call chain would have.
+                log_lines = heapq.merge(
+                    *[prefetch(page, self.MAX_EVENTS_PER_CALL) for page in pages],
+                    key=lambda line: line.timestamp,
+                )
 
-        def log_generator() -> Generator[Union[LogLine, object], None, None]:
-            interleaving_sanity = deque(maxlen=self.MAX_EVENTS_PER_CALL)
-            kwargs = {
-                "logGroupName": group_name,
-                "logStreamNames": stream_names,
-                "interleaved": True,
-            }
+            delivered = 0
+            for log_line in log_lines:
+                delivered += 1
+                yield log_line
 
-            if start_timestamp is not None:
-                kwargs["startTime"] = start_timestamp
+            self.count_lines(delivered)
 
-            if end_timestamp is not None:
-                kwargs["endTime"] = end_timestamp
+            if not tail:
+                return
+
+            time.sleep(interval.next(delivered))
+
+    def read_partitioned(
+        self,
+        group_name: str,
+        stream_names: List[str],
+        start_timestamp: int,
+        end_timestamp: int,
+        partitions: int,
+        filter_pattern: Optional[str],
+    ) -> Generator[LogLine, None, None]:
+        """
+        Split the range into partitions consecutive time windows, read them in
+        parallel, each into a temporary file that spills to disk beyond
+        SPOOL_BYTES, and yield the windows one after another once they're read.
+        Calls are still capped by the concurrency. Closing the generator stops the
+        windows being read after their current page.
+        """
+        size = max(1, math.ceil((end_timestamp - start_timestamp + 1) / partitions))
+        # endTime is inclusive, so windows end right before the next one starts
+        windows = [
+            (start, min(start + size - 1, end_timestamp))
+            for start in range(start_timestamp, end_timestamp + 1, size)
+        ]
 
+        stopped = threading.Event()
+        spools = parallel_imap(
+            lambda window: self.read_window(
+                group_name, stream_names, window[0], window[1], filter_pattern, stopped
+            ),
+            windows,
+            partitions,
+        )
+
+        try:
+            for spool in spools:
+                with spool:
+                    for row in spool:
+                        yield LogLine(*json.loads(row))
+        finally:
+            stopped.set()
+            spools.close()
+
+    def read_window(
+        self,
+        group_name: str,
+        stream_names: List[str],
+        start_timestamp: int,
+        end_timestamp: int,
+        filter_pattern: Optional[str],
+        stopped: threading.Event,
+    ) -> IO[str]:
+        spool = tempfile.SpooledTemporaryFile(
+            max_size=self.SPOOL_BYTES, mode="w+", encoding="utf-8"
+        )
+        log_lines = self.read_logs(
+            group_name,
+            stream_names,
+            start_timestamp,
+            end_timestamp,
+            False,
+            None,
+            filter_pattern,
+            stopped,
+        )
+
+        for line in log_lines:
+            row = [
+                line.log_stream_name,
+                line.timestamp,
+                line.message,
+                line.ingestion_time,
+                line.event_id,
+            ]
+            spool.write(json.dumps(row) + "\n")
+
+        spool.seek(0)
+        return spool
+
+    def query_insights(
+        self,
+        group_name: str,
+        stream_names: List[str],
+        query: str,
+        start_time: Optional[str],
+        end_time: Optional[str],
+    ) -> List[Dict[str, str]]:
+        """
+        Run a CloudWatch Logs Insights query over the given streams, e.g.
+        "stats count() by @logStream", and return its result rows, so aggregations
+        run server-side rather than over every raw line.
+        """
+        start_timestamp = self.parse_time_ago(start_time)
+        end_timestamp = self.parse_time_ago(end_time)
+        now = int(time.time())
+
+        query_string = f"{self.streams_filter(stream_names)} | {query}"
+        if len(query_string) > self.MAX_QUERY_LENGTH:
+            raise Exception(
+                f"Too many tasks for an Insights query: selecting their "
+                f"{len(stream_names)} streams takes {len(query_string)} characters, "
+                f"more than the {self.MAX_QUERY_LENGTH} a query can have."
+            )
+
+        with self.calls:
+            response = self.client.start_query(
+                logGroupName=group_name,
+                queryString=query_string,
+                startTime=(
+                    start_timestamp // 1000
+                    if start_timestamp is not None
+                    else now - self.DEFAULT_WINDOW
+                ),
+                endTime=end_timestamp // 1000 if end_timestamp is not None else now,
+            )
+            self.count_call()
+
+        query_id = response["queryId"]
+        interval = PollInterval(self.MIN_QUERY_INTERVAL, self.MAX_QUERY_INTERVAL)
+
+        try:
             while True:
-                response = self.client.filter_log_events(**kwargs)
-
-                for event in response.get("events", []):
-                    log_line = deserialize_log_line(event)
-
-                    if log_line.event_id not in interleaving_sanity:
-                        interleaving_sanity.append(log_line.event_id)
-                        yield log_line
-
-                if "nextToken" in response:
-                    kwargs["nextToken"] = response["nextToken"]
-                else:
-                    yield do_wait
-
-        for log_line in log_generator():
-            if log_line is do_wait:
-                if tail:
-                    time.sleep(self.tail_interval)
-                    continue
-                else:
+                time.sleep(interval.next(lines=0))
+
+                with self.calls:
+                    response = self.client.get_query_results(queryId=query_id)
+                    self.count_call()
+
+                status = response["status"]
+                if status == "Complete":
+                    break
+                elif status in self.QUERY_FAILED_STATUSES:
+                    raise Exception(f"Insights query {query_id} ended as {status}.")
+        except BaseException:
+            # Don't leave the query running, and counting towards the account's
+            # concurrent query limit, after an error or Ctrl-C
+            self.stop_query(query_id)
+            raise
+
+        rows = [
+            {field["field"]: field.get("value", "") for field in result}
+            for result in response.get("results", [])
+        ]
+        self.count_lines(len(rows))
+
+        # The pointer to the underlying log event, meaningless outside the console
+        return [
+            {name: value for name, value in row.items() if name != "@ptr"}
+            for row in rows
+        ]
+
+    def stop_query(self, query_id: str):
+        try:
+            self.client.stop_query(queryId=query_id)
+        except Exception:
+            pass
+
+    def streams_filter(self, stream_names: List[str]) -> str:
+        """
+        An Insights filter command selecting exactly the given streams, listing at
+        most MAX_STREAMS_PER_CALL of them per clause.
+        """
+        clauses = [
+            "@logStream in [" + ", ".join(json.dumps(name) for name in group) + "]"
+            for group in chunks(stream_names, self.MAX_STREAMS_PER_CALL)
+        ]
+        return "filter " + " or ".join(clauses)
+
+    def last_lines(
+        self, group_name: str, stream_names: List[str], lines: int
+    ) -> List[LogLine]:
+        """The last lines events of every stream, merged in timestamp order."""
+        streams = parallel_map(
+            lambda stream_name: self.read_backwards(group_name, stream_name, lines),
+            stream_names,
+            self.concurrency,
+        )
+        return list(heapq.merge(*streams, key=lambda line: line.timestamp))
+
+    def read_backwards(
+        self, group_name: str, stream_name: str, lines: int
+    ) -> List[LogLine]:
+        """
+        Read the last lines events of a stream with get_log_events, newest page
+        first, rather than paging through its whole history.
+        """
+        pages: Deque[List[LogLine]] = deque()
+        count = 0
+        kwargs: Dict[str, Any] = {
+            "logGroupName": group_name,
+            "logStreamName": stream_name,
+            "startFromHead": False,
+            "limit": max(1, min(lines, self.MAX_EVENTS_PER_CALL)),
+        }
+
+        while count < lines:
+            with self.calls:
+                response = self.client.get_log_events(**kwargs)
+                self.count_call()
+
+            events = response.get("events", [])
+            if len(events) == 0:
+                break
+
+            pages.appendleft(
+                [deserialize_stream_event(stream_name, event) for event in events]
+            )
+            count += len(events)
+
+            # The same token comes back once the start of the stream is reached
+            if response.get("nextBackwardToken") in (None, kwargs.get("nextToken")):
+                break
+            kwargs["nextToken"] = response["nextBackwardToken"]
+
+        events = [line for page in pages for line in page]
+        return events[len(events) - lines :] if lines > 0 else []
+
+    def group_streams(self, stream_names: List[str]) -> List[List[str]]:
+        """
+        Split stream names into evenly sized groups, one per worker, but never more
+        than filter_log_events accepts in a single call.
+        """
+        if len(stream_names) == 0:
+            return [stream_names]
+
+        groups = max(
+            min(self.concurrency, len(stream_names)),
+            math.ceil(len(stream_names) / self.MAX_STREAMS_PER_CALL),
+        )
+        return list(chunks(stream_names, math.ceil(len(stream_names) / groups)))
+
+    def fetch_pages(
+        self,
+        request: Dict[str, Any],
+        seen_event_ids: BoundedSet[str],
+        stopped: Optional[threading.Event] = None,
+    ) -> Generator[LogLine, None, None]:
+        """
+        Yield the events of every page of request that weren't seen before. Once
+        the last page is read, request is moved on to start at the newest event
+        seen, so the next tail poll only reads what is new. The events at that
+        timestamp come back again and are skipped as already seen.
+
+        Once stopped is set, no further pages are read.
+        """
+        newest: Optional[int] = None
+
+        while True:
+            with self.calls:
+                # Checked once a call may be made, which can take a while
+                if stopped is not None and stopped.is_set():
                     return
 
-            yield log_line
+                response = self.client.filter_log_events(**request)
+                self.count_call()
+
+            for event in response.get("events", []):
+                newest = max(newest or event["timestamp"], event["timestamp"])
+
+                if seen_event_ids.add(event["eventId"]):
+                    yield deserialize_log_line(event)
+
+            if "nextToken" not in response:
+                break
+
+            request["nextToken"] = response["nextToken"]
+
+        request.pop("nextToken", None)
+        if newest is not None:
+            request["startTime"] = newest
+
+    def count_call(self):
+        with self.stats_lock:
+            self.api_calls += 1
+
+    def count_lines(self, lines: int):
+        with self.stats_lock:
+            self.lines_delivered += lines
+
+    def usage_report(self) -> str:
+        """API calls per minute against lines delivered, e.g. to compare tails."""
+        minutes = max(time.monotonic() - self.started_at, 1.0) / ONE_MINUTE
+        per_call = self.lines_delivered / max(self.api_calls, 1)
+
+        return (
+            f"logs: {self.api_calls} calls ({self.api_calls / minutes:.1f}/min), "
+            f"{self.lines_delivered} lines ({self.lines_delivered / minutes:.1f}/min), "
+            f"{per_call:.1f} lines per call"
+        )
 
-    def parse_time_ago(self, timing: Optional[str]) -> Optional[int]:
+    @classmethod
+    def parse_time_ago(cls, timing: Optional[str]) -> Optional[int]:
         if timing is None:
             return None
 
-        ago_match = re.match(self.TIME_AGO_REGEX, timing)
+        ago_match = re.match(cls.TIME_AGO_REGEX, timing)
 
         if ago_match:
             amount, unit = ago_match.groups()
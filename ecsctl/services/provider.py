@@ -1,17 +1,32 @@
 import functools
+import threading
 
-from boto3.session import Session
-from ecsctl.services.ecs import EcsService
-from ecsctl.services.logs import AWSLogs
 from ecsctl.services.console import Console
 from ecsctl.services.config import Config
 
-from typing import Optional, Tuple, TypedDict
+from ecsctl.utils import parallel_map
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, TypedDict
+
+# boto3, the models and the serializers are only imported once a command asks for
+# a service, so commands like `config view` or `--help` never pay for them.
+if TYPE_CHECKING:
+    from boto3.session import Session
+    from ecsctl.services.cache import CredentialCache, DiskCache
+    from ecsctl.services.clients import ClientFactory
+    from ecsctl.services.ecs import EcsService
+    from ecsctl.services.logs import AWSLogs
+
+Origin = Dict[str, str]
 
 
 class Props(TypedDict):
     profile: Optional[str]
     region: Optional[str]
+    profiles: Optional[List[str]]
+    regions: Optional[List[str]]
+    concurrency: Optional[int]
+    cache: bool
+    cache_responses: bool
     debug: bool
 
 
@@ -20,30 +35,183 @@ class ServiceProvider:
         self.props = props
         self.config = Config()
         self.console = Console()
+        self.caches: List["DiskCache"] = []
+
+    @functools.cached_property
+    def concurrency(self) -> int:
+        from ecsctl.services.ecs import EcsService
+
+        return self.props.get("concurrency", None) or EcsService.DEFAULT_CONCURRENCY
+
+    @functools.cached_property
+    def clients(self) -> "ClientFactory":
+        from ecsctl.services.clients import ClientFactory
+        from ecsctl.services.service_models import ServiceModelCache
+
+        # Every level of fan-out shares the calls semaphore, so no client ever has
+        # more than the worker count in flight.
+        return ClientFactory(
+            max_pool_connections=max(10, self.concurrency),
+            credential_cache=(
+                self.create_credential_cache if self.props.get("cache", True) else None
+            ),
+            model_cache=ServiceModelCache() if self.props.get("cache", True) else None,
+        )
+
+    @functools.cached_property
+    def calls(self) -> threading.BoundedSemaphore:
+        """The ECS calls in flight across every cluster and (profile, region) target."""
+        return threading.BoundedSemaphore(self.concurrency)
+
+    def create_credential_cache(self, profile: str) -> "CredentialCache":
+        from ecsctl.services.cache import CredentialCache
+
+        cache = CredentialCache(profile)
+        self.caches.append(cache)
+        return cache
 
     @functools.cached_property
     def session(
         self,
-    ) -> Session:
-        return Session(
-            profile_name=self.props.get("profile", None),
-            region_name=self.props.get("region", None),
+    ) -> "Session":
+        return self.clients.session(self.props.get("profile", None))
+
+    def namespace_for(self, profile: Optional[str], client: Any) -> str:
+        """
+        The account and region the client's calls go to, as they were resolved, e.g.
+        from AWS_DEFAULT_REGION or environment credentials, rather than as they were
+        passed on the command line.
+        """
+        return f"{self.clients.identity(profile)}@{client.meta.region_name or ''}"
+
+    def create_ecs_api(
+        self, profile: Optional[str], region: Optional[str]
+    ) -> "EcsService":
+        from ecsctl.services.cache import ResponseCache, TaskDefinitionCache
+        from ecsctl.services.ecs import EcsService
+
+        client = self.clients.client("ecs", profile, region)
+        namespace = self.namespace_for(profile, client)
+        cache = self.props.get("cache", True)
+
+        definition_cache = TaskDefinitionCache(namespace) if cache else None
+        response_cache = ResponseCache(
+            namespace, enabled=cache and self.props.get("cache_responses", False)
+        )
+        self.caches += [c for c in (definition_cache, response_cache) if c is not None]
+
+        return EcsService(
+            client,
+            concurrency=self.concurrency,
+            definition_cache=definition_cache,
+            response_cache=response_cache,
+            calls=self.calls,
         )
 
     @functools.cached_property
     def ecs_api(
         self,
-    ) -> EcsService:
-        return EcsService(profile=self.props["profile"], region=self.props["region"])
+    ) -> "EcsService":
+        return self.create_ecs_api(*self.single_target())
+
+    @property
+    def targets(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        profiles = self.props.get("profiles", None) or [self.props.get("profile", None)]
+        regions = self.props.get("regions", None) or [self.props.get("region", None)]
+
+        return [(profile, region) for profile in profiles for region in regions]
+
+    def single_target(self) -> Tuple[Optional[str], Optional[str]]:
+        """The one (profile, region) commands that don't fan out run against."""
+        targets = self.targets
+
+        if len(targets) > 1:
+            raise Exception(
+                "Invalid options: --profiles/--regions are only supported by get "
+                "tasks/services/instances/events/clusters."
+            )
+
+        return targets[0]
+
+    @functools.cached_property
+    def ecs_apis(
+        self,
+    ) -> List[Tuple[Origin, "EcsService"]]:
+        """
+        One EcsService per (profile, region) target, paired with the origin its results
+        should be tagged with.
+        """
+        targets = self.targets
+
+        if len(targets) == 1:
+            return [({}, self.ecs_api)]
+
+        profiles = {profile for profile, _ in targets}
+        regions = {region for _, region in targets}
+
+        def origin(profile: Optional[str], region: Optional[str]) -> Origin:
+            tags = {}
+            if len(profiles) > 1:
+                tags["profile"] = profile or "default"
+            if len(regions) > 1:
+                tags["region"] = region or "default"
+            return tags
+
+        # Session and client creation is mostly credential and model loading, so set
+        # every target up in parallel rather than paying for them one after another.
+        services = parallel_map(
+            lambda target: self.create_ecs_api(*target), targets, len(targets)
+        )
+
+        return [
+            (origin(profile, region), service)
+            for (profile, region), service in zip(targets, services, strict=True)
+        ]
 
     @functools.cached_property
     def logs(
         self,
-    ) -> AWSLogs:
-        return AWSLogs(self.session)
+    ) -> "AWSLogs":
+        from ecsctl.services.logs import AWSLogs
+
+        return AWSLogs(
+            self.clients.client("logs", *self.single_target()),
+            concurrency=self.concurrency,
+        )
+
+    def disk_caches(self) -> List["DiskCache"]:
+        """Every on-disk cache, independent of the profile and region in use."""
+        from ecsctl.services.cache import (
+            CredentialCache,
+            ResponseCache,
+            TaskDefinitionCache,
+        )
+
+        return [
+            TaskDefinitionCache(namespace=""),
+            ResponseCache(namespace=""),
+            CredentialCache(profile=""),
+        ]
+
+    def close(self):
+        for cache in self.caches:
+            cache.save_stats()
+
+        if self.props.get("debug", False):
+            from ecsctl.services.throttle import throttling_report
+
+            report = throttling_report()
+
+            if report != "":
+                self.console.debug(report)
+
+            # Only when the command read logs, without creating a logs client
+            if "logs" in self.__dict__:
+                self.console.debug(self.logs.usage_report())
 
     def resolve(self) -> Tuple[Config, Console]:
         return (self.config, self.console)
 
-    def resolve_all(self) -> Tuple[Config, Console, EcsService]:
+    def resolve_all(self) -> Tuple[Config, Console, "EcsService"]:
+        self.single_target()
         return (self.config, self.console, self.ecs_api)
@@ -0,0 +1,140 @@
+import botocore
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from botocore import xform_name
+from botocore.loaders import Loader
+from ecsctl.services.cache import cache_home
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Every operation ecsctl calls, per service. Clients are created from models that
+# only contain these operations, so a call missing here fails with AttributeError.
+SERVICE_OPERATIONS: Dict[str, List[str]] = {
+    "ecs": [
+        "describe_clusters",
+        "describe_container_instances",
+        "describe_services",
+        "describe_task_definition",
+        "describe_tasks",
+        "list_clusters",
+        "list_container_instances",
+        "list_services",
+        "list_tasks",
+        "update_service",
+    ],
+    "logs": [
+        "filter_log_events",
+        "get_log_events",
+        "get_query_results",
+        "start_query",
+        "stop_query",
+    ],
+}
+
+
+def referenced_shapes(shape: Dict[str, Any]) -> List[str]:
+    refs = [shape[key] for key in ("member", "key", "value") if key in shape]
+    refs += list(shape.get("members", {}).values())
+    return [ref["shape"] for ref in refs]
+
+
+def without_documentation(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in item.items() if key != "documentation"}
+
+
+def trim_service_model(model: Dict[str, Any], operations: List[str]) -> Dict[str, Any]:
+    """
+    Keep only the given operations of a botocore service model, the shapes they
+    reference and none of the documentation, which makes up most of the model.
+    """
+    kept = {
+        name: without_documentation(operation)
+        for name, operation in model["operations"].items()
+        if xform_name(name) in operations
+    }
+
+    pending = [
+        ref["shape"]
+        for operation in kept.values()
+        for ref in [operation.get("input"), operation.get("output")]
+        + operation.get("errors", [])
+        if ref is not None
+    ]
+    shapes: Set[str] = set()
+
+    while len(pending) > 0:
+        name = pending.pop()
+        if name not in shapes:
+            shapes.add(name)
+            pending += referenced_shapes(model["shapes"][name])
+
+    def trim_shape(shape: Dict[str, Any]) -> Dict[str, Any]:
+        shape = without_documentation(shape)
+        if "members" in shape:
+            shape["members"] = {
+                name: without_documentation(member)
+                for name, member in shape["members"].items()
+            }
+        return shape
+
+    return {
+        **without_documentation(model),
+        "operations": kept,
+        "shapes": {name: trim_shape(model["shapes"][name]) for name in sorted(shapes)},
+    }
+
+
+class ServiceModelCache:
+    """
+    Trimmed copies of the service models ecsctl uses, written once per botocore
+    version and set of operations. Loading and parsing the full ecs and logs models
+    is a large part of every cold start, especially for the frozen binary.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        operations = json.dumps(SERVICE_OPERATIONS, sort_keys=True).encode("utf-8")
+        version = f"{botocore.__version__}-{hashlib.sha256(operations).hexdigest()[:8]}"
+
+        self.path = path or cache_home() / "service-models" / version
+        self.lock = threading.Lock()
+
+    def install(self, loader: Loader):
+        """Make loader prefer the trimmed models, writing any that are missing."""
+        with self.lock:
+            try:
+                for service, operations in SERVICE_OPERATIONS.items():
+                    self.write_model(loader, service, operations)
+            except OSError:
+                # e.g. a read-only home, the search path is left alone so clients
+                # load the full models that ship with botocore
+                return
+
+            if str(self.path) not in loader.search_paths:
+                loader.search_paths.insert(0, str(self.path))
+
+    def write_model(self, loader: Loader, service: str, operations: List[str]):
+        api_version = loader.determine_latest_version(service, "service-2")
+        file = self.path / service / api_version / "service-2.json"
+
+        if file.exists():
+            return
+
+        # A loader of its own, so the full model doesn't end up in the instance cache
+        # of the loader clients are created with
+        full_models = Loader(
+            extra_search_paths=list(loader.search_paths),
+            include_default_search_paths=False,
+        )
+        model = full_models.load_service_model(service, "service-2", api_version)
+        file.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=file.parent, prefix=".", delete=False
+        ) as temp_file:
+            json.dump(trim_service_model(model, operations), temp_file)
+
+        os.replace(temp_file.name, file)
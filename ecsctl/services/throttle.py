@@ -0,0 +1,135 @@
+import threading
+import time
+
+from botocore.config import Config
+from typing import Any, Dict, Optional, Tuple
+
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+}
+
+# Requests per second each (service, profile, region) starts out at, roughly the
+# sustained rate of the account level API limits for the calls ecsctl makes.
+INITIAL_RATES = {"ecs": 20.0, "logs": 10.0}
+
+# Throttled calls are retried with exponential backoff, on top of the limiter
+# slowing every other in-flight call down.
+RETRY_CONFIG = Config(retries={"mode": "standard", "max_attempts": 8})
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every client and thread calling one (service, profile,
+    region), as API limits apply per account and region.
+
+    The rate adapts to the responses it sees: it is halved on every throttling
+    error and slowly grows back, up to MAX_RATE_FACTOR times its initial value,
+    with every successful call.
+    """
+
+    MIN_RATE = 0.5
+    MAX_RATE_FACTOR = 2.0
+    RATE_INCREASE = 0.1
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.max_rate = rate * self.MAX_RATE_FACTOR
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.throttles = 0
+        self.throttled_seconds = 0.0
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.rate, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+
+            # Take the token now, possibly going into debt, and sleep outside the
+            # lock until the debt has been paid off by the refill rate.
+            self.tokens -= 1
+            self.requests += 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.throttled_seconds += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, throttled: bool):
+        with self.lock:
+            if throttled:
+                self.throttles += 1
+                self.rate = max(self.MIN_RATE, self.rate / 2)
+                self.tokens = min(self.tokens, 0.0)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.RATE_INCREASE)
+
+    def on_before_send(self, **kwargs: Any) -> None:
+        self.acquire()
+
+    def on_needs_retry(
+        self, response: Optional[Tuple[Any, Dict[str, Any]]] = None, **kwargs: Any
+    ) -> None:
+        if response is None:
+            return
+
+        http_response, parsed = response
+        code = parsed.get("Error", {}).get("Code", None)
+
+        self.record(
+            throttled=code in THROTTLING_ERROR_CODES or http_response.status_code == 429
+        )
+
+
+limiters: Dict[Tuple[str, str, str], RateLimiter] = {}
+limiters_lock = threading.Lock()
+
+
+def limiter_for(service: str, profile: str, region: str) -> RateLimiter:
+    with limiters_lock:
+        key = (service, profile, region)
+
+        if key not in limiters:
+            limiters[key] = RateLimiter(INITIAL_RATES.get(service, 20.0))
+
+        return limiters[key]
+
+
+def install_rate_limiter(client: Any, profile: str) -> RateLimiter:
+    """
+    Route every request, including retries, of a boto3 client created for profile
+    through its limiter.
+    """
+    limiter = limiter_for(
+        client.meta.service_model.service_name, profile, client.meta.region_name
+    )
+
+    client.meta.events.register("before-send", limiter.on_before_send)
+    client.meta.events.register("needs-retry", limiter.on_needs_retry)
+
+    return limiter
+
+
+def throttling_report() -> str:
+    lines = []
+
+    for (service, profile, region), limiter in sorted(limiters.items()):
+        lines.append(
+            f"{service} {profile} {region}: {limiter.requests} requests, "
+            f"{limiter.throttles} throttled, "
+            f"{limiter.throttled_seconds:.2f}s waiting on the rate limiter, "
+            f"rate {limiter.rate:.1f}/s"
+        )
+
+    return "\n".join(lines)
@@ -1,11 +1,37 @@
 import click
+import importlib
+import queue
+import threading
 import typing
 import traceback
+import weakref
 
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from click.core import Command, Context
+from click.formatting import HelpFormatter
+from click.shell_completion import CompletionItem
 from ecsctl.services.config import Config
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 BASE_SHELL_COLORS = [
     "red",
@@ -26,11 +52,258 @@ def chunks(items: List[Any], n: int):
         yield items[i : i + n]
 
 
+def chunked(items: Iterable[T], n: int) -> Generator[List[T], None, None]:
+    """Yield successive n-sized lists from any iterable, consuming it lazily."""
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == n:
+            yield batch
+            batch = []
+
+    if len(batch) > 0:
+        yield batch
+
+
+def parallel_imap(
+    function: Callable[[T], R], items: Iterable[T], concurrency: int
+) -> Generator[R, None, None]:
+    """
+    Lazily apply function to every item on a bounded thread pool.
+
+    At most `concurrency` calls are in flight at any time and results are yielded in
+    input order as soon as they, and everything before them, have completed.
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+
+        while len(pending) > 0:
+            yield pending.popleft().result()
+    finally:
+        # Don't wait for calls still running when the caller stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def prefetch(items: Iterable[T], size: int) -> Generator[T, None, None]:
+    """
+    Consume items on a background thread, keeping up to `size` of them buffered ahead
+    of the caller. The producer starts right away rather than on the first next(), so
+    several prefetched iterables fill up in parallel. Errors raised while producing
+    are re-raised to the caller, and closing or dropping the generator stops the
+    producer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    item_kind, error_kind, done_kind = range(3)
+
+    def offer(entry: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not offer((item_kind, item)):
+                    return
+        except Exception as ex:
+            offer((error_kind, ex))
+        else:
+            offer((done_kind, None))
+
+    def consume() -> Generator[T, None, None]:
+        try:
+            while True:
+                kind, value = buffer.get()
+                if kind == done_kind:
+                    return
+                elif kind == error_kind:
+                    raise value
+
+                yield value
+        finally:
+            stopped.set()
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    stream = consume()
+    # A generator that was never started doesn't run its finally when dropped
+    weakref.finalize(stream, stopped.set)
+    return stream
+
+
+def parallel_map(
+    function: Callable[[T], R], items: Iterable[T], concurrency: int
+) -> List[R]:
+    """Apply function to every item on a bounded thread pool, keeping input order."""
+    return list(parallel_imap(function, items, concurrency))
+
+
+class LazyList(Sequence[R]):
+    """
+    A read-only list that deserializes its raw items on first access, so nested
+    collections nobody reads, e.g. in table output, are never built.
+    """
+
+    __slots__ = ("_raw", "_deserialize", "_items")
+
+    def __init__(self, raw: List[Any], deserialize: Callable[[Any], R]):
+        self._raw: Optional[List[Any]] = raw
+        self._deserialize = deserialize
+        self._items: Optional[List[R]] = None
+
+    def materialize(self) -> List[R]:
+        if self._items is None:
+            self._items = [self._deserialize(item) for item in self._raw or []]
+            self._raw = None
+        return self._items
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __len__(self) -> int:
+        if self._items is None:
+            return len(self._raw or [])
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[R]:
+        return iter(self.materialize())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyList):
+            other = other.materialize()
+        return self.materialize() == other
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+
+def split_list(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+
+    return [item.strip() for item in value.split(",") if item.strip() != ""]
+
+
+class BoundedSet(Generic[T]):
+    """
+    A set that remembers at most maxlen items and forgets the oldest ones first,
+    with constant time membership tests, additions and evictions.
+    """
+
+    __slots__ = ("maxlen", "items", "order")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.items: Set[T] = set()
+        self.order: Deque[T] = deque()
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: T) -> bool:
+        """Remember item, returning False when it was already remembered."""
+        if item in self.items:
+            return False
+
+        if len(self.order) >= self.maxlen:
+            self.items.discard(self.order.popleft())
+
+        self.order.append(item)
+        self.items.add(item)
+        return True
+
+
 def filter_empty_values(json_dict: Dict[str, Optional[Any]]) -> Dict[str, Any]:
     return {k: v for k, v in json_dict.items() if v is not None}
 
 
-class ExceptionFormattedGroup(click.Group):
+class LazyGroup(click.Group):
+    """
+    A group whose subcommands are registered as "module:attribute" import paths with
+    their short help, and only imported once they are invoked. A command and its
+    dependencies, e.g. boto3, are never loaded for help, completion or other commands.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            self.add_command(self.load_command(cmd_name), cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name: str) -> Command:
+        import_path, short_help = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+
+        command = getattr(importlib.import_module(module_name), attribute)
+        command.short_help = command.short_help or short_help
+        return command
+
+    def short_help_for(self, cmd_name: str, limit: int) -> Optional[str]:
+        """The short help of a command, or None when it's hidden."""
+        if cmd_name in self.commands:
+            command = self.commands[cmd_name]
+            return None if command.hidden else command.get_short_help_str(limit)
+
+        short_help = self.lazy_commands[cmd_name][1]
+        return Command(cmd_name, short_help=short_help).get_short_help_str(limit)
+
+    def format_commands(self, ctx: Context, formatter: HelpFormatter):
+        names = self.list_commands(ctx)
+        if len(names) == 0:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = [(name, self.short_help_for(name, limit)) for name in names]
+        rows = [(name, help) for name, help in rows if help is not None]
+
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def shell_complete(self, ctx: Context, incomplete: str) -> List[CompletionItem]:
+        names = [
+            name for name in self.list_commands(ctx) if name.startswith(incomplete)
+        ]
+        helps = [(name, self.short_help_for(name, 45)) for name in names]
+
+        results = [
+            CompletionItem(name, help=help) for name, help in helps if help is not None
+        ]
+        # Options of the group itself, without loading every subcommand
+        results.extend(Command.shell_complete(self, ctx, incomplete))
+        return results
+
+
+class ExceptionFormattedGroup(LazyGroup):
     def resolve_command(self, ctx: Context, args: List[str]):
         self.__called_with_params = ctx.params
         return super().resolve_command(ctx, args)
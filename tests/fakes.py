@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+def make_cluster(name: str) -> Dict[str, Any]:
+    return {
+        "clusterArn": f"arn:aws:ecs:eu-west-1:123456789012:cluster/{name}",
+        "clusterName": name,
+        "status": "ACTIVE",
+        "registeredContainerInstancesCount": 0,
+        "activeServicesCount": 1,
+        "runningTasksCount": 1,
+        "pendingTasksCount": 0,
+        "settings": [],
+        "capacityProviders": [],
+    }
+
+
+def make_service(cluster: str, name: str) -> Dict[str, Any]:
+    return {
+        "serviceArn": f"arn:aws:ecs:eu-west-1:123456789012:service/{cluster}/{name}",
+        "serviceName": name,
+        "clusterArn": f"arn:aws:ecs:eu-west-1:123456789012:cluster/{cluster}",
+        "status": "ACTIVE",
+        "desiredCount": 1,
+        "runningCount": 1,
+        "pendingCount": 0,
+        "launchType": "FARGATE",
+        "taskDefinition": "api:1",
+        "createdAt": datetime(2024, 1, 1),
+        "schedulingStrategy": "REPLICA",
+    }
+
+
+class FakeEcsClient:
+    def __init__(self, services: Dict[str, List[str]]):
+        self.services = services
+
+    def list_clusters(self, **kwargs):
+        return {"clusterArns": list(self.services.keys())}
+
+    def describe_clusters(self, clusters: List[str], **kwargs):
+        return {"clusters": [make_cluster(name) for name in clusters]}
+
+    def list_services(self, cluster: str, **kwargs):
+        return {"serviceArns": self.services[cluster]}
+
+    def describe_services(self, cluster: str, services: List[str]):
+        return {"services": [make_service(cluster, name) for name in services]}
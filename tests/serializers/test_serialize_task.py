@@ -0,0 +1,38 @@
+import json
+
+from datetime import datetime
+from ecsctl.serializers import deserialize_task, serialize_task
+from pathlib import Path
+from typing import Any, Dict
+
+
+def parse_dates(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn recorded timestamps back into the datetimes boto3 returns."""
+    return {
+        key: (
+            datetime.fromisoformat(value)
+            if key.endswith("At") and isinstance(value, str)
+            else value
+        )
+        for key, value in item.items()
+    }
+
+
+FIXTURE = Path(__file__).parents[2] / "benchmarks" / "fixtures" / "describe_tasks.json"
+
+
+def test_deserialize_task_builds_nested_collections_when_accessed():
+    # Given
+    payload = json.loads(FIXTURE.read_text(), object_hook=parse_dates)["tasks"][0]
+
+    # When
+    task = deserialize_task(payload)
+
+    # Then
+    assert [container.name for container in task.containers] == [
+        "api",
+        "envoy",
+        "datadog-agent",
+    ]
+    assert task.containers[0].network_interfaces[0].ipv4_address == "10.0.12.34"
+    assert serialize_task(task)["attachments"][0]["type"] == "ElasticNetworkInterface"
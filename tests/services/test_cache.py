@@ -0,0 +1,214 @@
+import os
+
+from botocore.credentials import AssumeRoleCredentialFetcher, Credentials
+from datetime import datetime, timedelta, timezone
+from ecsctl.services.cache import (
+    CredentialCache,
+    DiskCache,
+    ResponseCache,
+    TaskDefinitionCache,
+)
+from ecsctl.services.ecs import EcsService
+
+ARN = "arn:aws:ecs:eu-west-1:123456789012:task-definition/api:412"
+
+
+def make_definition(arn: str = ARN):
+    return {
+        "taskDefinitionArn": arn,
+        "family": "api",
+        "taskRoleArn": "arn:aws:iam::123456789012:role/api",
+        "revision": 412,
+        "status": "ACTIVE",
+        "registeredAt": datetime(2024, 3, 28, 9, 12, tzinfo=timezone.utc),
+        "containerDefinitions": [],
+    }
+
+
+class FakeEcsClient:
+    def __init__(self):
+        self.calls = 0
+
+    def describe_task_definition(self, taskDefinition: str):
+        self.calls += 1
+        return {"taskDefinition": make_definition()}
+
+
+class FakeStsClient:
+    def __init__(self, expires_in: timedelta):
+        self.expires_in = expires_in
+        self.calls = 0
+
+    def assume_role(self, **kwargs):
+        self.calls += 1
+        return {
+            "Credentials": {
+                "AccessKeyId": "AKIA",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(timezone.utc) + self.expires_in,
+            }
+        }
+
+
+def fetch_credentials(client: FakeStsClient, cache: CredentialCache):
+    fetcher = AssumeRoleCredentialFetcher(
+        client_creator=lambda *args, **kwargs: client,
+        source_credentials=Credentials("AKIA", "secret"),
+        role_arn="arn:aws:iam::123456789012:role/admin",
+        cache=cache,
+    )
+    return fetcher.fetch_credentials()
+
+
+def test_disk_cache_round_trips_datetimes(tmp_path):
+    # Given
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+
+    # When
+    cache.put("key", make_definition())
+
+    # Then
+    assert cache.get("key") == make_definition()
+
+
+def test_disk_cache_evicts_the_least_recently_used_entries(tmp_path):
+    # Given
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+    cache.put("old", make_definition())
+    cache.put("used", make_definition())
+    os.utime(cache.file_for("old"), (0, 0))
+    os.utime(cache.file_for("used"), (0, 0))
+    cache.get("used")
+    cache.max_bytes = sum(entry.stat().st_size for entry in tmp_path.iterdir())
+
+    # When
+    cache.put("new", make_definition())
+
+    # Then
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
+def test_disk_cache_misses_entries_it_cant_read(tmp_path):
+    # Given
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+    cache.file_for("key").mkdir()
+
+    # When
+    value = cache.get("key")
+
+    # Then
+    assert value is None
+    assert cache.file_for("key").exists()
+
+
+def test_get_task_definition_only_describes_a_revision_once(tmp_path):
+    # Given
+    client = FakeEcsClient()
+    ecs_api = EcsService(
+        client,
+        definition_cache=TaskDefinitionCache("default@eu-west-1", path=tmp_path),
+    )
+
+    # When
+    first = ecs_api.get_task_definition("api:412")
+    second = ecs_api.get_task_definition("api:412")
+    by_arn = ecs_api.get_task_definition(ARN)
+
+    # Then
+    assert first == second == by_arn
+    assert client.calls == 1
+
+
+def test_get_task_definition_always_describes_the_latest_revision(tmp_path):
+    # Given
+    client = FakeEcsClient()
+    ecs_api = EcsService(
+        client,
+        definition_cache=TaskDefinitionCache("default@eu-west-1", path=tmp_path),
+    )
+
+    # When
+    ecs_api.get_task_definition("api")
+    ecs_api.get_task_definition("api")
+
+    # Then
+    assert client.calls == 2
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def list_tasks(self, **kwargs):
+        self.calls.append("list_tasks")
+        return {"taskArns": ["a", "b"], "ResponseMetadata": {}}
+
+    def update_service(self, **kwargs):
+        self.calls.append("update_service")
+        return {"service": {}}
+
+
+def test_cached_client_reuses_responses_until_a_mutating_call(tmp_path):
+    # Given
+    cache = ResponseCache("default@eu-west-1", path=tmp_path)
+    client = CountingClient()
+    cached_client = cache.wrap(client)
+
+    # When
+    first = cached_client.list_tasks(cluster="default")
+    second = cached_client.list_tasks(cluster="default")
+    cached_client.update_service(cluster="default", service="api")
+    cached_client.list_tasks(cluster="default")
+
+    # Then
+    assert first == second == {"taskArns": ["a", "b"]}
+    assert client.calls == ["list_tasks", "update_service", "list_tasks"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cached_client_expires_responses_after_their_ttl(tmp_path):
+    # Given
+    cache = ResponseCache("default@eu-west-1", path=tmp_path)
+    cache.TTLS = {"tasks": 0}
+    client = CountingClient()
+    cached_client = cache.wrap(client)
+
+    # When
+    cached_client.list_tasks(cluster="default")
+    cached_client.list_tasks(cluster="default")
+
+    # Then
+    assert client.calls == ["list_tasks", "list_tasks"]
+
+
+def test_credential_cache_reuses_credentials_across_invocations(tmp_path):
+    # Given
+    client = FakeStsClient(expires_in=timedelta(hours=1))
+
+    # When
+    first = fetch_credentials(client, CredentialCache("admin", path=tmp_path))
+    second = fetch_credentials(client, CredentialCache("admin", path=tmp_path))
+
+    # Then
+    assert first == second
+    assert client.calls == 1
+    assert oct(tmp_path.stat().st_mode & 0o777) == "0o700"
+    assert [oct(entry.stat().st_mode & 0o777) for entry in tmp_path.iterdir()] == [
+        "0o600"
+    ]
+
+
+def test_credential_cache_refreshes_credentials_close_to_expiry(tmp_path):
+    # Given
+    client = FakeStsClient(expires_in=timedelta(minutes=5))
+
+    # When
+    fetch_credentials(client, CredentialCache("admin", path=tmp_path))
+    fetch_credentials(client, CredentialCache("admin", path=tmp_path))
+    fetch_credentials(client, CredentialCache("readonly", path=tmp_path))
+
+    # Then
+    assert client.calls == 3
@@ -0,0 +1,50 @@
+import io
+
+from ecsctl.services.console import LogWriter
+
+
+class BrokenPipe(io.StringIO):
+    def write(self, text: str) -> int:
+        raise BrokenPipeError()
+
+
+def test_log_writer_writes_prefixed_lines_in_batches():
+    # Given
+    output = io.StringIO()
+    writer = LogWriter(output, {"api/app/1": "1: "})
+
+    # When
+    with writer:
+        writer.write("api/app/1", "first")
+        writer.write("api/app/2", "second")
+        buffered = output.getvalue()
+
+    # Then
+    assert buffered == ""
+    assert output.getvalue() == "1: first\nsecond\n"
+
+
+def test_log_writer_flushes_a_full_batch_right_away():
+    # Given
+    output = io.StringIO()
+    writer = LogWriter(output, {})
+    writer.MAX_BATCH_BYTES = 10
+
+    # When
+    writer.write("api/app/1", "a long line")
+
+    # Then
+    assert output.getvalue() == "a long line\n"
+
+
+def test_log_writer_stops_once_the_reader_went_away():
+    # Given
+    writer = LogWriter(BrokenPipe(), {})
+    writer.MAX_BATCH_BYTES = 1
+
+    # When
+    written = [writer.write("api/app/1", "line") for _ in range(2)]
+    writer.flush()
+
+    # Then
+    assert written == [False, False]
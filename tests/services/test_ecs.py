@@ -0,0 +1,261 @@
+import threading
+import time
+
+from datetime import datetime
+from ecsctl.services.ecs import EcsService
+from ecsctl.utils import parallel_map
+from typing import Any, Dict, List, Optional
+
+
+def make_task(arn: str) -> Dict[str, Any]:
+    return {
+        "taskArn": arn,
+        "taskDefinitionArn": "arn:aws:ecs:eu-west-1:123456789012:task-definition/api:1",
+        "clusterArn": "arn:aws:ecs:eu-west-1:123456789012:cluster/default",
+        "createdAt": datetime(2024, 1, 1),
+        "lastStatus": "RUNNING",
+        "desiredStatus": "RUNNING",
+        "healthStatus": "HEALTHY",
+        "launchType": "FARGATE",
+        "cpu": "256",
+        "memory": "512",
+        "group": "service:api",
+        "tags": [],
+        "containers": [],
+    }
+
+
+def make_instance(arn: str) -> Dict[str, Any]:
+    return {
+        "containerInstanceArn": arn,
+        "ec2InstanceId": "i-0123456789",
+        "status": "ACTIVE",
+        "agentConnected": True,
+        "runningTasksCount": 1,
+        "pendingTasksCount": 0,
+        "registeredAt": datetime(2024, 1, 1),
+    }
+
+
+def page(items: List[str], result_key: str, **kwargs) -> Dict[str, Any]:
+    start = int(kwargs.get("nextToken", "0"))
+    end = start + kwargs["maxResults"]
+    response: Dict[str, Any] = {result_key: items[start:end]}
+
+    if end < len(items):
+        response["nextToken"] = str(end)
+
+    return response
+
+
+class FakeEcsClient:
+    def __init__(self, task_arns: List[str], instance_arns: Optional[List[str]] = None):
+        self.task_arns = task_arns
+        self.instance_arns = instance_arns or []
+        self.calls: List[Dict[str, Any]] = []
+
+    def list_tasks(self, **kwargs):
+        self.calls.append(kwargs)
+        return page(self.task_arns, "taskArns", **kwargs)
+
+    def list_container_instances(self, **kwargs):
+        self.calls.append(kwargs)
+        return page(self.instance_arns, "containerInstanceArns", **kwargs)
+
+    def describe_container_instances(self, cluster: str, containerInstances: List[str]):
+        return {
+            "containerInstances": [make_instance(arn) for arn in containerInstances]
+        }
+
+    def describe_tasks(self, cluster: str, tasks: List[str]):
+        # Make earlier chunks finish last so ordering can't rely on timing
+        time.sleep(0.01 * (len(self.task_arns) - self.task_arns.index(tasks[0])) / 100)
+        return {"tasks": [make_task(arn) for arn in tasks]}
+
+
+def make_service(client: Any, concurrency: int) -> EcsService:
+    return EcsService(client, concurrency=concurrency)
+
+
+def test_get_tasks_describes_chunks_concurrently_in_a_stable_order():
+    # Given
+    task_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:task/default/{i}" for i in range(350)
+    ]
+    ecs_api = make_service(FakeEcsClient(task_arns), concurrency=4)
+
+    # When
+    tasks = ecs_api.get_tasks("default")
+
+    # Then
+    assert [task.arn for task in tasks] == task_arns
+
+
+def test_get_tasks_keeps_the_desired_status_on_every_page():
+    # Given
+    task_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:task/default/{i}" for i in range(250)
+    ]
+    client = FakeEcsClient(task_arns)
+    ecs_api = make_service(client, concurrency=1)
+
+    # When
+    tasks = ecs_api.get_tasks("default", status="stopped")
+
+    # Then
+    assert len(tasks) == 250
+    assert [call["desiredStatus"] for call in client.calls] == ["STOPPED"] * 3
+
+
+def test_get_instances_follows_next_token_with_the_requested_status():
+    # Given
+    instance_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:container-instance/default/{i}"
+        for i in range(150)
+    ]
+    client = FakeEcsClient([], instance_arns)
+    ecs_api = make_service(client, concurrency=2)
+
+    # When
+    instances = ecs_api.get_instances("default", [], status="DRAINING")
+
+    # Then
+    assert [instance.arn for instance in instances] == instance_arns
+    assert [call.get("nextToken") for call in client.calls] == [None, "100"]
+    assert all(call["status"] == "DRAINING" for call in client.calls)
+
+
+def test_get_instances_lists_every_state_for_status_all():
+    # Given
+    instance_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:container-instance/default/{i}"
+        for i in range(3)
+    ]
+    client = FakeEcsClient([], instance_arns)
+    ecs_api = make_service(client, concurrency=1)
+
+    # When
+    instances = ecs_api.get_instances("default", [], status="all")
+
+    # Then
+    assert [instance.arn for instance in instances] == instance_arns
+    assert [call.get("status") for call in client.calls] == [None]
+
+
+class RecordingEcsClient(FakeEcsClient):
+    def __init__(self, task_arns: List[str]):
+        super().__init__(task_arns)
+        self.events: List[str] = []
+
+    def list_tasks(self, **kwargs):
+        time.sleep(0.02)
+        self.events.append("list")
+        return super().list_tasks(**kwargs)
+
+    def describe_tasks(self, cluster: str, tasks: List[str]):
+        self.events.append("describe")
+        return {"tasks": [make_task(arn) for arn in tasks]}
+
+
+def test_get_tasks_starts_describing_before_listing_finishes():
+    # Given
+    task_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:task/default/{i}" for i in range(500)
+    ]
+    client = RecordingEcsClient(task_arns)
+    ecs_api = make_service(client, concurrency=4)
+
+    # When
+    tasks = ecs_api.get_tasks("default")
+
+    # Then
+    assert len(tasks) == 500
+    assert client.events.index("describe") < len(client.events) - 1 - list(
+        reversed(client.events)
+    ).index("list")
+
+
+class ClusterEcsClient:
+    def __init__(self, cluster_arns: List[str]):
+        self.cluster_arns = cluster_arns
+        self.describe_calls: List[Dict[str, Any]] = []
+
+    def list_clusters(self, **kwargs):
+        return page(self.cluster_arns, "clusterArns", **kwargs)
+
+    def describe_clusters(self, **kwargs):
+        self.describe_calls.append(kwargs)
+        return {
+            "clusters": [
+                {
+                    "clusterArn": arn,
+                    "clusterName": arn.split("/")[-1],
+                    "status": "ACTIVE",
+                    "registeredContainerInstancesCount": 0,
+                    "activeServicesCount": 0,
+                    "runningTasksCount": 0,
+                    "pendingTasksCount": 0,
+                }
+                for arn in kwargs["clusters"]
+            ]
+        }
+
+
+def test_get_clusters_pages_and_describes_in_batches_of_100():
+    # Given
+    cluster_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:cluster/{i}" for i in range(230)
+    ]
+    client = ClusterEcsClient(cluster_arns)
+    ecs_api = make_service(client, concurrency=4)
+
+    # When
+    clusters = ecs_api.get_clusters([])
+
+    # Then
+    assert [cluster.arn for cluster in clusters] == cluster_arns
+    assert [len(call["clusters"]) for call in client.describe_calls] == [100, 100, 30]
+    assert all("include" not in call for call in client.describe_calls)
+
+
+class ConcurrencyRecordingEcsClient(FakeEcsClient):
+    def __init__(self, task_arns: List[str]):
+        super().__init__(task_arns)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def describe_tasks(self, cluster: str, tasks: List[str]):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.in_flight -= 1
+
+        return {"tasks": [make_task(arn) for arn in tasks]}
+
+
+def test_nested_fan_out_shares_one_limit_of_calls_in_flight():
+    # Given
+    task_arns = [
+        f"arn:aws:ecs:eu-west-1:123456789012:task/default/{i}" for i in range(800)
+    ]
+    client = ConcurrencyRecordingEcsClient(task_arns)
+    calls = threading.BoundedSemaphore(4)
+    targets = [EcsService(client, concurrency=4, calls=calls) for _ in range(2)]
+
+    # When
+    results = parallel_map(
+        lambda target: parallel_map(
+            lambda cluster: target.get_tasks(cluster), ["blue", "green"], 4
+        ),
+        targets,
+        2,
+    )
+
+    # Then
+    assert [len(tasks) for clusters in results for tasks in clusters] == [800] * 4
+    assert client.max_in_flight == 4
@@ -0,0 +1,384 @@
+import json
+import pytest
+import re
+import time
+
+from ecsctl.services.logs import AWSLogs, PollInterval, server_side_pattern
+from typing import Any, Dict, List
+
+
+def make_event(event_id: int, stream: str = "api/app/1") -> Dict[str, Any]:
+    return {
+        "logStreamName": stream,
+        "timestamp": 1700000000000 + event_id,
+        "message": f"line {event_id}",
+        "ingestionTime": 1700000000000 + event_id,
+        "eventId": str(event_id),
+    }
+
+
+class FakeLogsClient:
+    def __init__(self, pages: List[List[Dict[str, Any]]]):
+        self.pages = pages
+        self.requests: List[Dict[str, Any]] = []
+
+    def filter_log_events(self, nextToken: int = 0, **kwargs):
+        self.requests.append(kwargs)
+        events = [
+            event
+            for event in self.pages[nextToken]
+            if event["logStreamName"] in kwargs["logStreamNames"]
+        ]
+
+        response: Dict[str, Any] = {"events": events}
+        if nextToken + 1 < len(self.pages):
+            response["nextToken"] = nextToken + 1
+        return response
+
+
+def test_query_logs_yields_events_repeated_across_pages_once():
+    # Given
+    client = FakeLogsClient(
+        [[make_event(1), make_event(2)], [make_event(2), make_event(3)]]
+    )
+
+    # When
+    lines = AWSLogs(client).query_logs("group", ["api/app/1"], None, None)
+
+    # Then
+    assert [line.message for line in lines] == ["line 1", "line 2", "line 3"]
+
+
+def test_query_logs_merges_streams_fetched_in_parallel_in_timestamp_order():
+    # Given
+    streams = ["api/app/1", "api/app/2", "api/app/3"]
+    client = FakeLogsClient(
+        [
+            [make_event(index, streams[index % 3]) for index in range(0, 6)],
+            [make_event(index, streams[index % 3]) for index in range(6, 12)],
+        ]
+    )
+
+    # When
+    lines = list(
+        AWSLogs(client, concurrency=4).query_logs("group", streams, None, None)
+    )
+
+    # Then
+    assert [line.event_id for line in lines] == [str(index) for index in range(12)]
+    assert len(client.requests) == 6
+    assert all(len(request["logStreamNames"]) == 1 for request in client.requests)
+
+
+def test_query_logs_splits_streams_beyond_the_filter_log_events_limit():
+    # Given
+    streams = [f"api/app/{index}" for index in range(250)]
+    client = FakeLogsClient(
+        [[make_event(index, streams[index]) for index in range(250)]]
+    )
+
+    # When
+    lines = list(AWSLogs(client).query_logs("group", streams, None, None))
+
+    # Then
+    assert [line.event_id for line in lines] == [str(index) for index in range(250)]
+    assert len(client.requests) == 3
+    assert max(len(request["logStreamNames"]) for request in client.requests) <= 100
+
+
+class FakeStreamClient:
+    """get_log_events over one stream, read backwards in pages of `limit` events."""
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self.events = events
+        self.calls = 0
+
+    def get_log_events(self, limit: int, nextToken: str = "", **kwargs):
+        self.calls += 1
+        end = int(nextToken.removeprefix("b/") or len(self.events))
+        start = max(0, end - limit)
+        return {
+            "events": self.events[start:end],
+            "nextBackwardToken": f"b/{start}",
+            "nextForwardToken": f"f/{end}",
+        }
+
+
+def test_query_logs_reads_the_last_lines_backwards():
+    # Given
+    client = FakeStreamClient([make_event(index) for index in range(50)])
+    logs = AWSLogs(client)
+    logs.MAX_EVENTS_PER_CALL = 4
+
+    # When
+    lines = list(logs.query_logs("group", ["api/app/1"], None, None, lines=10))
+
+    # Then
+    assert [line.message for line in lines] == [f"line {i}" for i in range(40, 50)]
+    assert [line.log_stream_name for line in lines] == ["api/app/1"] * 10
+    assert client.calls == 3
+
+
+def test_query_logs_reads_a_bounded_window_without_a_start_time():
+    # Given
+    client = FakeLogsClient([[make_event(1)]])
+
+    # When
+    before = int(time.time() * 1000)
+    list(AWSLogs(client).query_logs("group", ["api/app/1"], None, None))
+
+    # Then
+    start_time = client.requests[0]["startTime"]
+    assert before - AWSLogs.DEFAULT_WINDOW * 1000 - 1000 <= start_time
+    assert start_time <= before - AWSLogs.DEFAULT_WINDOW * 1000 + 1000
+
+
+def test_tail_resumes_from_the_last_seen_timestamp(monkeypatch):
+    # Given
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    client = FakeLogsClient([[make_event(1), make_event(2)]])
+    lines = AWSLogs(client).query_logs("group", ["api/app/1"], "1h", None, tail=True)
+
+    # When
+    first = [next(lines), next(lines)]
+    client.pages = [[make_event(2), make_event(3)]]
+    third = next(lines)
+
+    # Then
+    assert [line.event_id for line in first + [third]] == ["1", "2", "3"]
+    assert client.requests[1]["startTime"] == make_event(2)["timestamp"]
+    assert "nextToken" not in client.requests[1]
+
+
+def test_poll_interval_shrinks_while_busy_and_backs_off_while_idle():
+    # Given
+    interval = PollInterval(minimum=1, maximum=8)
+
+    # When
+    idle = [interval.next(lines=0) for _ in range(10)]
+    busy = [interval.next(lines=5) for _ in range(10)]
+
+    # Then
+    assert 4 <= idle[-1] <= 8
+    assert 0.5 <= busy[-1] <= 1
+
+
+def test_query_logs_reads_ahead_into_a_bounded_buffer():
+    # Given
+    client = FakeLogsClient([[make_event(index)] for index in range(4)])
+    logs = AWSLogs(client, concurrency=2)
+    logs.PREFETCH_LINES = 1
+
+    # When
+    lines = logs.query_logs("group", ["api/app/1"], "1h", None)
+    deadline = time.monotonic() + 5
+    while len(client.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+
+    # Then
+    assert len(client.requests) == 2
+    assert [line.event_id for line in lines] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.parametrize(
+    "expression, pattern",
+    [
+        ("connection refused", '"connection refused"'),
+        ("ERROR: timeout", '"ERROR: timeout"'),
+        (r"java\.lang\.OutOfMemoryError", '"java.lang.OutOfMemoryError"'),
+        ("ERROR.*timeout", None),
+        (r"\d+ retries", None),
+        ('say "hi"', None),
+        ("", None),
+    ],
+)
+def test_server_side_pattern_only_translates_plain_text(expression, pattern):
+    assert server_side_pattern(re.compile(expression)) == pattern
+
+
+def test_query_logs_pushes_plain_text_grep_down_to_the_api():
+    # Given
+    client = FakeLogsClient([[make_event(1), make_event(2)]])
+
+    # When
+    lines = AWSLogs(client).query_logs(
+        "group", ["api/app/1"], "1h", None, grep=re.compile("line 2")
+    )
+
+    # Then
+    assert len(list(lines)) == 2
+    assert client.requests[0]["filterPattern"] == '"line 2"'
+
+
+def test_query_logs_matches_regular_expressions_client_side():
+    # Given
+    client = FakeLogsClient([[make_event(index) for index in range(12)]])
+
+    # When
+    lines = AWSLogs(client).query_logs(
+        "group", ["api/app/1"], "1h", None, grep=re.compile(r"line 1\d")
+    )
+
+    # Then
+    assert [line.message for line in lines] == ["line 10", "line 11"]
+    assert "filterPattern" not in client.requests[0]
+
+
+class FakeInsightsClient:
+    def __init__(self, statuses: List[str]):
+        self.statuses = statuses
+        self.queries: List[Dict[str, Any]] = []
+        self.stopped: List[str] = []
+
+    def start_query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {"queryId": "query-1"}
+
+    def get_query_results(self, queryId: str):
+        return {
+            "status": self.statuses.pop(0),
+            "results": [
+                [
+                    {"field": "@logStream", "value": "api/app/1"},
+                    {"field": "count()", "value": "3"},
+                    {"field": "@ptr", "value": "pointer"},
+                ]
+            ],
+        }
+
+    def stop_query(self, queryId: str):
+        self.stopped.append(queryId)
+
+
+def test_query_insights_polls_until_the_query_completes(monkeypatch):
+    # Given
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    client = FakeInsightsClient(["Scheduled", "Running", "Complete"])
+
+    # When
+    rows = AWSLogs(client).query_insights(
+        "group", ["api/app/1"], "stats count() by @logStream", "6h", None
+    )
+
+    # Then
+    assert rows == [{"@logStream": "api/app/1", "count()": "3"}]
+    assert client.queries[0]["queryString"] == (
+        'filter @logStream in ["api/app/1"] | stats count() by @logStream'
+    )
+    assert client.statuses == []
+
+
+def test_query_insights_stops_failed_queries(monkeypatch):
+    # Given
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    client = FakeInsightsClient(["Running", "Failed"])
+
+    # When
+    with pytest.raises(Exception, match="Failed"):
+        AWSLogs(client).query_insights(
+            "group", ["api/app/1"], "fields @message", None, None
+        )
+
+    # Then
+    assert client.stopped == ["query-1"]
+
+
+def test_streams_filter_selects_exactly_the_given_streams():
+    # Given
+    streams = [f"api/app/{index}" for index in range(150)]
+
+    # When
+    command = AWSLogs(None).streams_filter(streams)
+
+    # Then
+    clauses = command.removeprefix("filter ").split(" or ")
+    selected = [json.loads(clause.removeprefix("@logStream in ")) for clause in clauses]
+    assert [len(names) for names in selected] == [100, 50]
+    assert [name for names in selected for name in names] == streams
+
+
+def test_query_insights_rejects_selections_longer_than_a_query_can_be():
+    # Given
+    client = FakeInsightsClient([])
+    streams = [f"api/app/{index:032x}" for index in range(500)]
+
+    # When
+    with pytest.raises(Exception, match="Too many tasks"):
+        AWSLogs(client).query_insights("group", streams, "fields @message", None, None)
+
+    # Then
+    assert client.queries == []
+
+
+class FakeTimedLogsClient:
+    """filter_log_events over events one second apart, honouring the time range."""
+
+    def __init__(self, events: int):
+        self.events = [make_event(index * 1000) for index in range(events)]
+        self.requests: List[Dict[str, Any]] = []
+
+    def filter_log_events(self, startTime: int, endTime: int, **kwargs):
+        self.requests.append({"startTime": startTime, "endTime": endTime})
+        return {
+            "events": [
+                event
+                for event in self.events
+                if startTime <= event["timestamp"] <= endTime
+            ]
+        }
+
+
+def test_query_logs_reads_time_windows_in_parallel_and_in_order():
+    # Given
+    client = FakeTimedLogsClient(100)
+    logs = AWSLogs(client, concurrency=4)
+    logs.SPOOL_BYTES = 100
+
+    # When
+    lines = list(
+        logs.query_logs(
+            "group",
+            ["api/app/1"],
+            "2023-11-14T22:13:20Z",
+            "2023-11-14T22:14:59Z",
+            partitions=4,
+        )
+    )
+
+    # Then
+    assert [line.event_id for line in lines] == [str(i * 1000) for i in range(100)]
+    windows = sorted((r["startTime"], r["endTime"]) for r in client.requests)
+    assert len(windows) == 4
+    assert all(
+        end + 1 == next_start
+        for (_, end), (next_start, _) in zip(windows, windows[1:], strict=False)
+    )
+
+
+class SlowTimedLogsClient(FakeTimedLogsClient):
+    def filter_log_events(self, startTime: int, endTime: int, **kwargs):
+        time.sleep(0.02)
+        return super().filter_log_events(startTime, endTime, **kwargs)
+
+
+def test_closing_a_partitioned_read_stops_reading_windows():
+    # Given
+    client = SlowTimedLogsClient(100)
+    logs = AWSLogs(client, concurrency=2)
+    lines = logs.query_logs(
+        "group",
+        ["api/app/1"],
+        "2023-11-14T22:13:20Z",
+        "2023-11-14T22:14:59Z",
+        partitions=20,
+    )
+
+    # When
+    next(lines)
+    lines.close()
+    calls = len(client.requests)
+    time.sleep(0.2)
+
+    # Then
+    assert len(client.requests) <= calls + 2 < 20
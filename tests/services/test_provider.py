@@ -0,0 +1,117 @@
+from ecsctl.services.provider import ServiceProvider
+
+
+def make_provider(monkeypatch, tmp_path, **props) -> ServiceProvider:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+
+    return ServiceProvider(
+        props={
+            "profile": None,
+            "region": None,
+            "profiles": None,
+            "regions": None,
+            "concurrency": None,
+            "cache": False,
+            "debug": False,
+            **props,
+        }
+    )
+
+
+def test_ecs_apis_creates_one_service_per_region_tagged_with_its_origin(
+    monkeypatch, tmp_path
+):
+    # Given
+    provider = make_provider(
+        monkeypatch, tmp_path, regions=["eu-west-1", "us-east-1", "ap-south-1"]
+    )
+
+    # When
+    ecs_apis = provider.ecs_apis
+
+    # Then
+    assert [origin for origin, _ in ecs_apis] == [
+        {"region": "eu-west-1"},
+        {"region": "us-east-1"},
+        {"region": "ap-south-1"},
+    ]
+    assert [api.client.meta.region_name for _, api in ecs_apis] == [
+        "eu-west-1",
+        "us-east-1",
+        "ap-south-1",
+    ]
+
+
+def test_ecs_apis_leaves_a_single_target_untagged(monkeypatch, tmp_path):
+    # Given
+    provider = make_provider(monkeypatch, tmp_path, region="eu-west-1")
+
+    # When
+    ecs_apis = provider.ecs_apis
+
+    # Then
+    assert ecs_apis == [({}, provider.ecs_api)]
+
+
+def test_ecs_apis_uses_a_single_profiles_or_regions_value(monkeypatch, tmp_path):
+    # Given
+    for name in ("AWS_CONFIG_FILE", "AWS_PROFILE", "AWS_DEFAULT_REGION"):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / ".aws").mkdir()
+    (tmp_path / ".aws" / "config").write_text(
+        "[default]\nregion = eu-west-1\n[profile prod]\nregion = ap-south-1\n"
+    )
+
+    # When
+    by_region = make_provider(monkeypatch, tmp_path, regions=["us-east-1"])
+    by_profile = make_provider(monkeypatch, tmp_path, profiles=["prod"])
+
+    # Then
+    assert [api.client.meta.region_name for _, api in by_region.ecs_apis] == [
+        "us-east-1"
+    ]
+    assert [api.client.meta.region_name for _, api in by_profile.ecs_apis] == [
+        "ap-south-1"
+    ]
+
+
+def test_clients_are_shared_and_pooled_for_the_configured_concurrency(
+    monkeypatch, tmp_path
+):
+    # Given
+    provider = make_provider(monkeypatch, tmp_path, region="eu-west-1", concurrency=16)
+
+    # When
+    ecs = provider.clients.client("ecs", None, "eu-west-1")
+
+    # Then
+    assert provider.ecs_api.client.client.client is ecs
+    assert provider.logs.client is provider.clients.client("logs", None, "eu-west-1")
+    assert ecs.meta.config.max_pool_connections == 16
+    assert ecs.meta.config.tcp_keepalive is True
+    assert ecs.meta.config.retries["mode"] == "standard"
+
+
+def test_caches_are_scoped_to_the_resolved_account_and_region(monkeypatch, tmp_path):
+    # Given
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    namespaces = []
+
+    # When
+    for access_key_id in ("AKIAFIRST", "AKIASECOND"):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", access_key_id)
+        provider = make_provider(monkeypatch, tmp_path, cache=True)
+        ecs_api = provider.ecs_api
+        namespaces.append(ecs_api.definition_cache.namespace)
+        namespaces.append(ecs_api.client.cache.namespace)
+
+    # Then
+    assert namespaces == [
+        "default:AKIAFIRST@eu-west-1",
+        "default:AKIAFIRST@eu-west-1",
+        "default:AKIASECOND@eu-west-1",
+        "default:AKIASECOND@eu-west-1",
+    ]
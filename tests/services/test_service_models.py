@@ -0,0 +1,42 @@
+import re
+
+from boto3.session import Session
+from botocore import xform_name
+from ecsctl.services import ecs, logs
+from ecsctl.services.service_models import SERVICE_OPERATIONS, ServiceModelCache
+from pathlib import Path
+
+
+def test_every_operation_ecsctl_calls_is_kept_in_the_trimmed_models():
+    # Given
+    called = {
+        "ecs": Path(ecs.__file__).read_text(),
+        "logs": Path(logs.__file__).read_text(),
+    }
+
+    for service, source in called.items():
+        # When
+        operations = set(re.findall(r"self\.client\.(\w+)", source))
+        operations |= set(re.findall(r"list_arns\(\s*\"(\w+)\"", source))
+
+        # Then
+        assert operations <= set(SERVICE_OPERATIONS[service])
+
+
+def test_clients_are_created_from_the_trimmed_models(tmp_path):
+    # Given
+    session = Session(
+        aws_access_key_id="test", aws_secret_access_key="test", region_name="eu-west-1"
+    )
+    loader = session._session.get_component("data_loader")
+
+    # When
+    ServiceModelCache(path=tmp_path).install(loader)
+    client = session.client("ecs")
+
+    # Then
+    assert sorted(
+        xform_name(name) for name in client.meta.service_model.operation_names
+    ) == sorted(SERVICE_OPERATIONS["ecs"])
+    assert client.meta.service_model.shape_for("Task").members["taskArn"] is not None
+    assert len(list(tmp_path.glob("*/*/service-2.json"))) == len(SERVICE_OPERATIONS)
@@ -0,0 +1,53 @@
+from collections import namedtuple
+from ecsctl.services.throttle import RateLimiter, limiter_for
+
+HttpResponse = namedtuple("HttpResponse", ["status_code"])
+
+
+def test_rate_limiter_halves_its_rate_on_throttling_errors():
+    # Given
+    limiter = RateLimiter(rate=20.0)
+
+    # When
+    limiter.on_needs_retry(
+        response=(HttpResponse(400), {"Error": {"Code": "ThrottlingException"}})
+    )
+
+    # Then
+    assert limiter.rate == 10.0
+    assert limiter.throttles == 1
+
+
+def test_rate_limiter_grows_back_on_success_up_to_its_maximum():
+    # Given
+    limiter = RateLimiter(rate=1.0)
+
+    # When
+    for _ in range(100):
+        limiter.on_needs_retry(response=(HttpResponse(200), {}))
+
+    # Then
+    assert limiter.rate == 1.0 * RateLimiter.MAX_RATE_FACTOR
+
+
+def test_rate_limiter_waits_once_the_burst_is_used_up():
+    # Given
+    limiter = RateLimiter(rate=100.0)
+
+    # When
+    for _ in range(105):
+        limiter.acquire()
+
+    # Then
+    assert limiter.requests == 105
+    assert limiter.throttled_seconds > 0
+
+
+def test_profiles_in_the_same_region_get_a_limiter_each():
+    # When
+    first = limiter_for("ecs", "production", "eu-west-1")
+    second = limiter_for("ecs", "staging", "eu-west-1")
+
+    # Then
+    assert first is not second
+    assert first is limiter_for("ecs", "production", "eu-west-1")
@@ -0,0 +1,134 @@
+import json
+import pytest
+import subprocess
+import sys
+
+from click.testing import CliRunner
+from ecsctl.commands import cli
+from ecsctl.services.ecs import EcsService
+from ecsctl.services.provider import ServiceProvider
+from tests.fakes import FakeEcsClient
+from typing import List
+
+
+@pytest.fixture
+def ecs_api(monkeypatch, tmp_path) -> EcsService:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    monkeypatch.delenv("ECS_DEFAULT_CLUSTER", raising=False)
+
+    ecs_api = EcsService(FakeEcsClient({"blue": ["api"], "green": ["web", "worker"]}))
+    monkeypatch.setattr(ServiceProvider, "ecs_api", property(lambda _: ecs_api))
+    return ecs_api
+
+
+def test_get_services_tags_every_service_with_its_cluster(ecs_api: EcsService):
+    # When
+    result = CliRunner().invoke(
+        cli, ["get", "services", "--all-clusters", "-o", "json"]
+    )
+
+    # Then
+    services = json.loads(result.output)
+    assert sorted((s["cluster"], s["name"]) for s in services) == [
+        ("blue", "api"),
+        ("green", "web"),
+        ("green", "worker"),
+    ]
+
+
+def test_get_services_adds_a_cluster_column_for_multiple_clusters(
+    ecs_api: EcsService,
+):
+    # When
+    result = CliRunner().invoke(cli, ["get", "services", "-c", "blue,green"])
+
+    # Then
+    lines = result.output.splitlines()
+    assert lines[0].split()[:2] == ["CLUSTER", "NAME"]
+    assert len(lines) == 4
+
+
+@pytest.mark.parametrize("args", [["--help"], ["config", "view"]])
+def test_commands_without_aws_calls_dont_import_boto3_or_the_daemon(
+    tmp_path, args: List[str]
+):
+    # Given
+    script = (
+        "import sys\n"
+        "from ecsctl.commands import cli\n"
+        f"cli({args!r}, standalone_mode=False)\n"
+        "modules = ['boto3', 'tabulate', 'ecsctl.daemon']\n"
+        "print(*(module in sys.modules for module in modules))"
+    )
+
+    # When
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env={"HOME": str(tmp_path), "PATH": ""},
+    )
+
+    # Then
+    assert result.stdout.splitlines()[-1] == "False False False"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--parallel", "4", "--tail"],
+        ["--insights", "stats count()", "--grep", "error"],
+        ["--until-match"],
+        ["--grep", "("],
+    ],
+)
+def test_logs_rejects_options_that_cant_be_combined(
+    ecs_api: EcsService, args: List[str]
+):
+    # When
+    result = CliRunner().invoke(cli, ["logs", "-s", "api", *args])
+
+    # Then
+    assert str(result.exception).startswith("Invalid")
+
+
+@pytest.mark.parametrize(
+    "args, option",
+    [
+        (["--lines", "10", "--start", "2h ago"], "--lines"),
+        (["--lines", "10", "--end", "1h ago"], "--lines"),
+        (["--start", "1h ago", "--end", "2h ago"], "--end"),
+        (["--start", "2024-01-01T10:00:00Z", "--end", "2024-01-01T10:00:00Z"], "--end"),
+        (["--end", "2h ago"], "--end"),
+        (["--end", "2024-01-01T10:00:00Z", "--tail"], "--end"),
+    ],
+)
+def test_logs_rejects_invalid_option_values(
+    ecs_api: EcsService, args: List[str], option: str
+):
+    # When
+    result = CliRunner().invoke(cli, ["logs", "-s", "api", *args])
+
+    # Then
+    assert result.exit_code == 2
+    assert f"Invalid value for {option!r}" in result.output
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--regions", "eu-west-1,us-east-1", "scale", "api", "-c", "blue", "-r", "0"],
+        ["--profiles", "dev,prod", "logs", "-s", "api", "-c", "blue"],
+    ],
+)
+def test_commands_without_fan_out_reject_several_targets(
+    ecs_api: EcsService, args: List[str]
+):
+    # When
+    result = CliRunner().invoke(cli, args)
+
+    # Then
+    assert str(result.exception).startswith(
+        "Invalid options: --profiles/--regions are only supported by get"
+    )
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import pytest
+import threading
+
+from ecsctl.daemon import DaemonServer, ProviderPool, command_name, forward
+from ecsctl.services.ecs import EcsService
+from ecsctl.services.provider import ServiceProvider
+from tests.fakes import FakeEcsClient
+
+
+@pytest.fixture
+def daemon(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    monkeypatch.delenv("ECS_DEFAULT_CLUSTER", raising=False)
+    monkeypatch.delenv("ECS_CTL_NO_DAEMON", raising=False)
+
+    # Every provider the daemon creates gets its own EcsService, like real ones do
+    monkeypatch.setattr(
+        ServiceProvider,
+        "ecs_api",
+        property(
+            lambda provider: provider.__dict__.setdefault(
+                "ecs_api", EcsService(FakeEcsClient({"blue": ["api", "web"]}))
+            )
+        ),
+    )
+
+    path = tmp_path / "daemon.sock"
+    server = DaemonServer(path, idle_timeout=60)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server, path
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_command_name_skips_root_options():
+    assert command_name(["-p", "dev", "--debug", "get", "tasks"]) == "get"
+    assert command_name(["--regions", "eu-west-1,us-east-1", "scale"]) == "scale"
+    assert command_name(["--help"]) is None
+
+
+def test_forward_runs_commands_in_the_daemon_with_a_warm_provider(daemon):
+    # Given
+    server, path = daemon
+    stdout = io.StringIO()
+
+    # When
+    first = forward(["get", "services", "-c", "blue", "-o", "json"], path, stdout)
+    second = forward(["get", "services", "-c", "blue", "-o", "json"], path, stdout)
+
+    # Then
+    outputs = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert (first, second) == (0, 0)
+    assert [[s["name"] for s in output] for output in outputs] == [
+        ["web", "api"],
+        ["web", "api"],
+    ]
+    assert len(server.pool.providers) == 1
+
+
+def test_forward_relays_errors_from_the_daemon(daemon):
+    # Given
+    _, path = daemon
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    # When
+    exit_code = forward(["get", "services"], path, stdout, stderr)
+
+    # Then
+    assert exit_code == 0
+    assert "either --cluster or --all-clusters is required" in stderr.getvalue()
+
+
+def test_forward_falls_back_to_running_in_process(tmp_path, monkeypatch):
+    monkeypatch.delenv("ECS_CTL_NO_DAEMON", raising=False)
+
+    assert forward(["get", "tasks"], tmp_path / "missing.sock") is None
+    assert forward(["exec", "-t", "abc"], tmp_path / "missing.sock") is None
+
+
+def test_provider_pool_replaces_providers_once_credentials_are_rewritten(
+    monkeypatch, tmp_path
+):
+    # Given
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("AWS_SHARED_CREDENTIALS_FILE", raising=False)
+    credentials = tmp_path / ".aws" / "credentials"
+    credentials.parent.mkdir()
+    credentials.write_text("[default]\naws_access_key_id = AKIAFIRST\n")
+    os.utime(credentials, (0, 0))
+
+    pool = ProviderPool()
+    props = {"profile": None, "region": "eu-west-1", "cache": False}
+    first = pool.provider_for(props)
+
+    # When
+    same = pool.provider_for(props)
+    credentials.write_text("[default]\naws_access_key_id = AKIASECOND\n")
+    rewritten = pool.provider_for(props)
+
+    # Then
+    assert same is first
+    assert rewritten is not first
+    assert len(pool.providers) == 1
@@ -0,0 +1,85 @@
+import pytest
+import threading
+
+from ecsctl.utils import BoundedSet, LazyList, chunked, parallel_map, prefetch
+
+
+def test_chunked_yields_a_short_final_chunk():
+    # When
+    chunks = list(chunked(iter(range(5)), 2))
+
+    # Then
+    assert chunks == [[0, 1], [2, 3], [4]]
+
+
+def test_parallel_map_keeps_input_order():
+    # When
+    results = parallel_map(lambda x: x * 2, iter(range(50)), concurrency=8)
+
+    # Then
+    assert results == [x * 2 for x in range(50)]
+
+
+def test_prefetch_reraises_producer_errors():
+    # Given
+    def items():
+        yield 1
+        raise ValueError("boom")
+
+    # When
+    stream = prefetch(items(), size=2)
+
+    # Then
+    assert next(stream) == 1
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_prefetch_starts_producing_before_the_first_item_is_requested():
+    # Given
+    started = threading.Event()
+
+    def items():
+        started.set()
+        yield 1
+
+    # When
+    stream = prefetch(items(), size=2)
+
+    # Then
+    assert started.wait(timeout=5)
+    assert list(stream) == [1]
+
+
+def test_lazy_list_only_deserializes_on_first_access():
+    # Given
+    calls = []
+
+    def deserialize(item: int) -> int:
+        calls.append(item)
+        return item * 2
+
+    items = LazyList([1, 2, 3], deserialize)
+
+    # When
+    length = len(items)
+
+    # Then
+    assert length == 3
+    assert calls == []
+    assert items[0] == 2
+    assert items == [2, 4, 6]
+    assert calls == [1, 2, 3]
+
+
+def test_bounded_set_forgets_the_oldest_items_first():
+    # Given
+    seen = BoundedSet(maxlen=2)
+
+    # When
+    added = [seen.add(item) for item in ["a", "b", "a", "c", "a"]]
+
+    # Then
+    assert added == [True, True, False, True, True]
+    assert "b" not in seen
+    assert len(seen) == 2